@@ -4,6 +4,7 @@ from discord.ext import commands
 
 from config import Config
 from logger import setup_logger
+from pipeline import MessagePipeline
 
 
 def build_intents(cfg: dict) -> discord.Intents:
@@ -41,6 +42,8 @@ class MyBot(commands.Bot):
         self.cfg = cfg
         self.log = logger
         self.start_ts = time.time()
+        pipeline_cfg = cfg.section("message_pipeline")
+        self.message_pipeline = MessagePipeline(logger, slow_stage_ms=int(pipeline_cfg.get("slow_stage_ms", 250) or 0))
         intents = build_intents(cfg.section("intents"))
         super().__init__(command_prefix="!", intents=intents, help_command=None)
 
@@ -85,6 +88,10 @@ class MyBot(commands.Bot):
             await self.change_presence(activity=activity, status=discord.Status.online)
         self.log.info(f"ready | user={self.user} | id={self.user.id}")
 
+    async def on_message(self, message: discord.Message):
+        await self.message_pipeline.dispatch(message)
+        await self.process_commands(message)
+
     async def on_command_error(self, ctx: commands.Context, error: Exception):
         self.log.exception(f"command_error | cmd={getattr(ctx.command,'name',None)} | {error}")
 
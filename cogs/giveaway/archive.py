@@ -0,0 +1,142 @@
+import asyncio
+import gzip
+import json
+import os
+from typing import Any, Iterator
+
+from .index import summary_fields
+
+
+class ArchiveStore:
+    def __init__(self, path: str, log=None):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.log = log
+        self._lock = asyncio.Lock()
+        self.index: dict[str, int] = {}
+        self.summaries: dict[str, dict[str, Any]] = {}
+        self.patches: dict[str, dict[str, Any]] = {}
+        self._load_index()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def _load_index(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if not os.path.exists(self.index_path):
+            return
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t", 2)
+                if len(parts) < 2:
+                    continue
+                if parts[1] == "@":
+                    try:
+                        patch = json.loads(parts[2]) if len(parts) == 3 else None
+                    except ValueError:
+                        continue
+                    if isinstance(patch, dict):
+                        self.patches.setdefault(parts[0], {}).update(patch)
+                    continue
+                try:
+                    offset = int(parts[1])
+                except ValueError:
+                    continue
+                if not 0 <= offset < size:
+                    continue
+                self.index[parts[0]] = offset
+                self.patches.pop(parts[0], None)
+                if len(parts) == 3:
+                    try:
+                        summary = json.loads(parts[2])
+                    except ValueError:
+                        continue
+                    if isinstance(summary, dict):
+                        self.summaries[parts[0]] = summary
+
+    def _append(self, key: str, record: dict[str, Any]) -> int:
+        entries = record.get("entries", [])
+        header = {k: v for k, v in record.items() if k != "entries"}
+        header["entry_count"] = len(entries)
+        with open(self.path, "ab") as f:
+            f.seek(0, os.SEEK_END)
+            offset = f.tell()
+            with gzip.GzipFile(fileobj=f, mode="wb") as gz:
+                gz.write((json.dumps(header, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+                for e in entries:
+                    gz.write((json.dumps(e, separators=(",", ":")) + "\n").encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        summary = json.dumps(summary_fields(record), ensure_ascii=False, separators=(",", ":"))
+        self._append_index(f"{key}\t{offset}\t{summary}\n")
+        return offset
+
+    def _append_index(self, line: str) -> None:
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _stream(self, offset: int, patch: dict[str, Any] | None = None) -> Iterator[Any]:
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            with gzip.GzipFile(fileobj=f, mode="rb") as gz:
+                header = json.loads(gz.readline().decode("utf-8"))
+                if not isinstance(header, dict):
+                    return
+                if patch:
+                    header.update(patch)
+                yield header
+                if "entry_count" not in header:
+                    yield from header.get("entries", [])
+                    return
+                for _ in range(int(header["entry_count"])):
+                    line = gz.readline()
+                    if not line:
+                        return
+                    yield json.loads(line.decode("utf-8"))
+
+    def _read(self, offset: int, patch: dict[str, Any] | None = None) -> dict[str, Any] | None:
+        it = self._stream(offset, patch)
+        header = next(it, None)
+        if header is None:
+            return None
+        record = {k: v for k, v in header.items() if k != "entry_count"}
+        record["entries"] = list(it)
+        return record
+
+    def stream(self, key: str) -> Iterator[Any] | None:
+        offset = self.index.get(key)
+        if offset is None:
+            return None
+        return self._stream(offset, self.patches.get(key))
+
+    async def put(self, key: str, record: dict[str, Any]) -> None:
+        async with self._lock:
+            offset = await asyncio.to_thread(self._append, key, record)
+            self.index[key] = offset
+            self.summaries[key] = summary_fields(record)
+            self.patches.pop(key, None)
+
+    async def patch(self, key: str, fields: dict[str, Any]) -> None:
+        if key not in self.index:
+            return
+        line = json.dumps(fields, ensure_ascii=False, separators=(",", ":"))
+        async with self._lock:
+            await asyncio.to_thread(self._append_index, f"{key}\t@\t{line}\n")
+            self.patches.setdefault(key, {}).update(fields)
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        offset = self.index.get(key)
+        if offset is None:
+            return None
+        try:
+            return await asyncio.to_thread(self._read, offset, self.patches.get(key))
+        except Exception as e:
+            if self.log:
+                self.log.warning(f"giveaway_archive_read_failed | giveaway={key} | offset={offset} | {e}")
+            return None
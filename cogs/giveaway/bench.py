@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from .entries import EntryStore
+from .loadtest import _percentile
+
+
+def _rewrite_everything(path: str, existing: int, joins: int) -> tuple[float, list[float]]:
+    data = {"1": {"prize": "bench", "ended": False, "entries": list(range(1, existing + 1))}}
+    tmp = path + ".tmp"
+    latencies = []
+    start = time.perf_counter()
+    for i in range(joins):
+        t0 = time.perf_counter()
+        uid = 10_000_000 + i
+        entries = data["1"]["entries"]
+        if uid not in entries:
+            entries.append(uid)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return time.perf_counter() - start, latencies
+
+
+async def _group_commit(path: str, existing: int, joins: int, concurrency: int, commit_ms: float) -> tuple[float, list[float], int]:
+    store = EntryStore(path, commit_delay=commit_ms / 1000)
+    for uid in range(1, existing + 1):
+        store.get("1").add(uid, 0)
+    store._pending = store._snapshot()
+    store.flush()
+    base = store.commits
+
+    sem = asyncio.Semaphore(max(1, concurrency))
+    latencies: list[float] = []
+
+    async def join(uid: int):
+        async with sem:
+            t0 = time.perf_counter()
+            store.toggle("1", uid)
+            await store.sync()
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[join(10_000_000 + i) for i in range(joins)])
+    elapsed = time.perf_counter() - start
+    await store.close()
+    return elapsed, latencies, store.commits - base
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Giveaway join durability benchmark.")
+    p.add_argument("--existing", type=int, default=20000, help="Entrants already in the giveaway")
+    p.add_argument("--joins", type=int, default=2000)
+    p.add_argument("--rewrite-joins", type=int, default=100, help="Joins for the rewrite-everything baseline")
+    p.add_argument("--concurrency", type=int, default=500)
+    p.add_argument("--commit-ms", type=float, default=5.0)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        elapsed, lat = _rewrite_everything(os.path.join(tmpdir, "giveaways.json"), args.existing, args.rewrite_joins)
+        lat.sort()
+        base_rate = args.rewrite_joins / elapsed
+        print(
+            f"rewrite_everything | existing={args.existing} | joins={args.rewrite_joins} | throughput={base_rate:.0f}/s | "
+            f"p50={_percentile(lat, 50):.1f}ms | p99={_percentile(lat, 99):.1f}ms | fsyncs={args.rewrite_joins}"
+        )
+
+        elapsed, lat, commits = asyncio.run(
+            _group_commit(os.path.join(tmpdir, "entries.log"), args.existing, args.joins, args.concurrency, args.commit_ms)
+        )
+        lat.sort()
+        rate = args.joins / elapsed
+        print(
+            f"group_commit | existing={args.existing} | joins={args.joins} | throughput={rate:.0f}/s | "
+            f"p50={_percentile(lat, 50):.1f}ms | p99={_percentile(lat, 99):.1f}ms | fsyncs={commits} | "
+            f"batch_avg={args.joins / max(1, commits):.1f} | speedup={rate / base_rate:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import time
+from typing import Any, Callable
+
+import discord
+from discord.utils import DISCORD_EPOCH
+
+
+def _ids(v) -> frozenset[int]:
+    if not isinstance(v, (list, tuple, set, frozenset)):
+        return frozenset()
+    out = set()
+    for x in v:
+        try:
+            i = int(x)
+        except Exception:
+            continue
+        if i > 0:
+            out.add(i)
+    return frozenset(out)
+
+
+def _num(v) -> int:
+    try:
+        return max(0, int(v))
+    except Exception:
+        return 0
+
+
+def _format_age(seconds: int) -> str:
+    if seconds % 86400 == 0:
+        return f"{seconds // 86400} day(s)"
+    if seconds % 3600 == 0:
+        return f"{seconds // 3600} hour(s)"
+    return f"{max(1, seconds // 60)} minute(s)"
+
+
+class Eligibility:
+    __slots__ = ("required", "blacklist", "min_level", "min_account_age", "min_member_age", "role_error")
+
+    def __init__(
+        self,
+        required: frozenset[int] = frozenset(),
+        blacklist: frozenset[int] = frozenset(),
+        min_level: int = 0,
+        min_account_age: int = 0,
+        min_member_age: int = 0,
+        role_error: str = "You are not allowed to join this giveaway.",
+    ):
+        self.required = required
+        self.blacklist = blacklist
+        self.min_level = min_level
+        self.min_account_age = min_account_age
+        self.min_member_age = min_member_age
+        self.role_error = role_error
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any], role_error: str) -> "Eligibility":
+        if not isinstance(d, dict):
+            d = {}
+        return cls(
+            required=_ids(d.get("required_role_ids")),
+            blacklist=_ids(d.get("blacklist_role_ids")),
+            min_level=_num(d.get("min_level")),
+            min_account_age=_num(d.get("min_account_age_seconds")),
+            min_member_age=_num(d.get("min_member_seconds")),
+            role_error=role_error,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "required_role_ids": sorted(self.required),
+            "blacklist_role_ids": sorted(self.blacklist),
+            "min_level": self.min_level,
+            "min_account_age_seconds": self.min_account_age,
+            "min_member_seconds": self.min_member_age,
+        }
+
+    def check(self, member: discord.Member, level_of: Callable[[int], int] | None = None, now: float | None = None) -> str | None:
+        if self.blacklist and any(member.get_role(rid) is not None for rid in self.blacklist):
+            return self.role_error
+        if self.required and not any(member.get_role(rid) is not None for rid in self.required):
+            return self.role_error
+
+        if self.min_account_age or self.min_member_age:
+            now = time.time() if now is None else now
+            if self.min_account_age:
+                created = ((member.id >> 22) + DISCORD_EPOCH) / 1000
+                if now - created < self.min_account_age:
+                    return f"Your account must be at least {_format_age(self.min_account_age)} old to join this giveaway."
+            if self.min_member_age:
+                joined = member.joined_at
+                if joined is None or now - joined.timestamp() < self.min_member_age:
+                    return f"You must have been in this server for at least {_format_age(self.min_member_age)} to join this giveaway."
+
+        if self.min_level and level_of is not None:
+            if level_of(member.id) < self.min_level:
+                return f"You must be at least level {self.min_level} to join this giveaway."
+
+        return None
@@ -0,0 +1,392 @@
+import asyncio
+import os
+import secrets
+import time
+from typing import Iterable, Iterator
+
+
+def _add_line(giveaway_id: str, uid: int, ts: int, weight: int) -> str:
+    if weight != 1:
+        return f"+\t{giveaway_id}\t{uid}\t{ts}\t{weight}\n"
+    return f"+\t{giveaway_id}\t{uid}\t{ts}\n"
+
+
+class _Cursor:
+    __slots__ = ("pos", "extra", "added")
+
+    def __init__(self):
+        self.pos = 0
+        self.extra: list[tuple[int, int, int]] = []
+        self.added: set[int] = set()
+
+
+class EntrySet:
+    __slots__ = ("_ids", "_joined", "_weights", "_pos", "_tree", "_weighted", "_cursors")
+
+    def __init__(self):
+        self._ids: list[int] = []
+        self._joined: list[int] = []
+        self._weights: list[int] = []
+        self._pos: dict[int, int] = {}
+        self._tree: list[int] = [0]
+        self._weighted = 0
+        self._cursors: list[_Cursor] = []
+
+    @classmethod
+    def from_items(cls, items) -> "EntrySet":
+        s = cls()
+        for x in items:
+            try:
+                s.add(int(x[0]), int(x[1]), int(x[2]) if len(x) > 2 else 1)
+            except Exception:
+                continue
+        return s
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, uid: int) -> bool:
+        return uid in self._pos
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def items(self) -> Iterator[tuple[int, int, int]]:
+        return zip(self._ids, self._joined, self._weights)
+
+    def snapshot(self, chunk_size: int) -> Iterator[list[tuple[int, int, int]]]:
+        size = max(1, chunk_size)
+        cur = _Cursor()
+        self._cursors.append(cur)
+        try:
+            while True:
+                chunk = cur.extra
+                cur.extra = []
+                end = min(len(self._ids), cur.pos + size)
+                for i in range(cur.pos, end):
+                    uid = self._ids[i]
+                    if uid not in cur.added:
+                        chunk.append((uid, self._joined[i], self._weights[i]))
+                cur.pos = end
+                if chunk:
+                    yield chunk
+                elif cur.pos >= len(self._ids) and not cur.extra:
+                    return
+        finally:
+            self._cursors.remove(cur)
+
+    def weight(self, uid: int) -> int:
+        i = self._pos.get(uid)
+        return self._weights[i] if i is not None else 0
+
+    def total_weight(self) -> int:
+        return self._prefix(len(self._ids))
+
+    def _prefix(self, i: int) -> int:
+        tree = self._tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _update(self, i: int, delta: int) -> None:
+        tree = self._tree
+        n = len(tree) - 1
+        i += 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def _find(self, r: int) -> int:
+        tree = self._tree
+        n = len(tree) - 1
+        pos = 0
+        step = 1 << n.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= r:
+                pos = nxt
+                r -= tree[nxt]
+            step >>= 1
+        return pos
+
+    def add(self, uid: int, ts: int, weight: int = 1) -> bool:
+        if uid in self._pos:
+            return False
+        weight = max(1, weight)
+        i = len(self._ids) + 1
+        self._tree.append(weight + self._prefix(i - 1) - self._prefix(i - (i & -i)))
+        self._pos[uid] = i - 1
+        self._ids.append(uid)
+        self._joined.append(ts)
+        self._weights.append(weight)
+        if weight != 1:
+            self._weighted += 1
+        for c in self._cursors:
+            c.added.add(uid)
+        return True
+
+    def discard(self, uid: int) -> bool:
+        i = self._pos.pop(uid, None)
+        if i is None:
+            return False
+        w = self._weights[i]
+        if w != 1:
+            self._weighted -= 1
+        last = len(self._ids) - 1
+        if self._cursors:
+            self._track_discard(uid, i, last)
+        if i < last:
+            last_w = self._weights[last]
+            self._update(i, last_w - w)
+            self._ids[i] = self._ids[last]
+            self._joined[i] = self._joined[last]
+            self._weights[i] = last_w
+            self._pos[self._ids[i]] = i
+        self._tree.pop()
+        self._ids.pop()
+        self._joined.pop()
+        self._weights.pop()
+        return True
+
+    def _track_discard(self, uid: int, i: int, last: int) -> None:
+        for c in self._cursors:
+            if uid in c.added:
+                c.added.discard(uid)
+            elif i >= c.pos:
+                c.extra.append((uid, self._joined[i], self._weights[i]))
+            if i < c.pos <= last and self._ids[last] not in c.added:
+                c.extra.append((self._ids[last], self._joined[last], self._weights[last]))
+
+    def sample(self, count: int, exclude: set[int] | None = None) -> list[int]:
+        exclude = exclude or set()
+        n = len(self._ids)
+        if count <= 0 or n == 0:
+            return []
+        if self._weighted:
+            return self._sample_weighted(count, exclude)
+        rng = secrets.SystemRandom()
+        if count * 4 >= n or len(exclude) * 2 >= n:
+            pool = [u for u in self._ids if u not in exclude]
+            return rng.sample(pool, min(count, len(pool)))
+
+        out: list[int] = []
+        seen = set(exclude)
+        attempts = 0
+        limit = count * 16
+        while len(out) < count and attempts < limit:
+            attempts += 1
+            uid = self._ids[rng.randrange(n)]
+            if uid in seen:
+                continue
+            seen.add(uid)
+            out.append(uid)
+        if len(out) < count:
+            pool = [u for u in self._ids if u not in seen]
+            out.extend(rng.sample(pool, min(count - len(out), len(pool))))
+        return out
+
+    def _sample_weighted(self, count: int, exclude: set[int]) -> list[int]:
+        rng = secrets.SystemRandom()
+        removed: list[int] = []
+        out: list[int] = []
+        try:
+            for uid in exclude:
+                i = self._pos.get(uid)
+                if i is not None:
+                    self._update(i, -self._weights[i])
+                    removed.append(i)
+            total = self.total_weight()
+            while len(out) < count and total > 0:
+                i = self._find(rng.randrange(total))
+                out.append(self._ids[i])
+                self._update(i, -self._weights[i])
+                removed.append(i)
+                total -= self._weights[i]
+        finally:
+            for i in removed:
+                self._update(i, self._weights[i])
+        return out
+
+
+class EntryStore:
+    def __init__(self, path: str, log=None, compact_min: int = 10000, commit_delay: float = 0.005):
+        self.path = path
+        self.log = log
+        self.compact_min = max(1, compact_min)
+        self.commit_delay = max(0.0, commit_delay)
+        self.sets: dict[str, EntrySet] = {}
+        self.commits = 0
+        self._pending: list[str] = []
+        self._next: asyncio.Future | None = None
+        self._writing: asyncio.Future | None = None
+        self._records = 0
+        self._commit_task: asyncio.Task | None = None
+        self._load()
+
+    def _load(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if not os.path.exists(self.path):
+            return
+        records = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                records += 1
+                try:
+                    self._apply(parts)
+                except (IndexError, ValueError):
+                    continue
+        self._records = records
+
+    def _apply(self, parts: list[str]) -> None:
+        op = parts[0]
+        if op == "+":
+            weight = int(parts[4]) if len(parts) > 4 else 1
+            self.sets.setdefault(parts[1], EntrySet()).add(int(parts[2]), int(parts[3]), weight)
+        elif op == "-":
+            s = self.sets.get(parts[1])
+            if s is not None:
+                s.discard(int(parts[2]))
+        elif op == "x":
+            self.sets.pop(parts[1], None)
+
+    def get(self, giveaway_id: str) -> EntrySet:
+        s = self.sets.get(giveaway_id)
+        if s is None:
+            s = EntrySet()
+            self.sets[giveaway_id] = s
+        return s
+
+    def has(self, giveaway_id: str) -> bool:
+        return giveaway_id in self.sets
+
+    def count(self, giveaway_id: str) -> int:
+        s = self.sets.get(giveaway_id)
+        return len(s) if s is not None else 0
+
+    def add(self, giveaway_id: str, uid: int, ts: int | None = None, weight: int = 1) -> bool:
+        ts = int(time.time()) if ts is None else ts
+        if not self.get(giveaway_id).add(uid, ts, weight):
+            return False
+        self._append(_add_line(giveaway_id, uid, ts, weight))
+        return True
+
+    def discard(self, giveaway_id: str, uid: int) -> bool:
+        s = self.sets.get(giveaway_id)
+        if s is None or not s.discard(uid):
+            return False
+        self._append(f"-\t{giveaway_id}\t{uid}\n")
+        return True
+
+    def toggle(self, giveaway_id: str, uid: int, weight: int = 1) -> bool:
+        if uid in self.get(giveaway_id):
+            self.discard(giveaway_id, uid)
+            return False
+        self.add(giveaway_id, uid, weight=weight)
+        return True
+
+    def drop(self, giveaway_id: str) -> None:
+        if self.sets.pop(giveaway_id, None) is not None:
+            self._append(f"x\t{giveaway_id}\n")
+
+    def _append(self, line: str) -> None:
+        self._pending.append(line)
+        if self._next is None:
+            self._next = asyncio.get_running_loop().create_future()
+        if self._commit_task is None or self._commit_task.done():
+            self._commit_task = asyncio.create_task(self._committer())
+
+    async def sync(self) -> None:
+        fut = self._next or self._writing
+        if fut is not None:
+            await asyncio.shield(fut)
+
+    async def close(self) -> None:
+        while self._commit_task is not None and not self._commit_task.done():
+            await asyncio.shield(self._commit_task)
+        self.flush()
+
+    def _needs_compact(self) -> bool:
+        live = sum(len(s) for s in self.sets.values())
+        return self._records > max(self.compact_min, live * 2)
+
+    def _snapshot(self) -> list[str]:
+        return [_add_line(gid, uid, ts, weight) for gid, s in self.sets.items() for uid, ts, weight in s.items()]
+
+    def _write(self, lines: list[str]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_snapshot(self, lines: list[str]) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    async def _committer(self) -> None:
+        while self._pending:
+            if self.commit_delay > 0:
+                await asyncio.sleep(self.commit_delay)
+            lines, fut = self._pending, self._next
+            self._pending, self._next = [], None
+            self._writing = fut
+            try:
+                if self._needs_compact():
+                    snapshot = self._snapshot()
+                    await asyncio.to_thread(self._write_snapshot, snapshot)
+                    if self.log:
+                        self.log.info(f"giveaway_entries_compacted | records={self._records} | live={len(snapshot)}")
+                    self._records = len(snapshot)
+                else:
+                    await asyncio.to_thread(self._write, lines)
+                    self._records += len(lines)
+                self.commits += 1
+                if fut is not None and not fut.done():
+                    fut.set_result(len(lines))
+            except Exception as e:
+                if self.log:
+                    self.log.exception(f"giveaway_entries_commit_error | lines={len(lines)} | {e}")
+                self._pending[:0] = lines
+                if self._next is None:
+                    self._next = asyncio.get_running_loop().create_future()
+                if fut is not None and not fut.done():
+                    fut.set_exception(e)
+                    fut.exception()
+                await asyncio.sleep(0.5)
+            finally:
+                self._writing = None
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        lines, fut = self._pending, self._next
+        self._pending, self._next = [], None
+        if self._records + len(lines) > self.compact_min and self._needs_compact():
+            self._write_snapshot(self._snapshot())
+            self._records = sum(len(s) for s in self.sets.values())
+        else:
+            self._write(lines)
+            self._records += len(lines)
+        self.commits += 1
+        if fut is not None and not fut.done():
+            fut.set_result(len(lines))
+
+    def import_legacy(self, giveaway_id: str, entries: Iterable) -> int:
+        s = self.get(giveaway_id)
+        now = int(time.time())
+        added = 0
+        for x in entries:
+            try:
+                uid = int(x)
+            except Exception:
+                continue
+            if uid > 0 and s.add(uid, now):
+                self._pending.append(f"+\t{giveaway_id}\t{uid}\t{now}\n")
+                added += 1
+        return added
@@ -0,0 +1,56 @@
+import csv
+import gzip
+import io
+import json
+import tempfile
+from datetime import datetime, timezone
+
+FORMATS = ("csv", "jsonl")
+
+
+class EntrantExport:
+    def __init__(self, fmt: str, winner_ids: set[int], spool_bytes: int = 8 * 1024 * 1024):
+        self.fmt = fmt if fmt in FORMATS else "csv"
+        self.winner_ids = winner_ids
+        self.rows = 0
+        self.file = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+        self._gz = gzip.GzipFile(fileobj=self.file, mode="wb")
+        self._text = io.TextIOWrapper(self._gz, encoding="utf-8", newline="")
+        self._csv = None
+        if self.fmt == "csv":
+            self._csv = csv.writer(self._text)
+            self._csv.writerow(["user_id", "joined_at", "weight", "winner"])
+
+    @property
+    def filename_suffix(self) -> str:
+        return f".{self.fmt}.gz"
+
+    def write(self, uid: int, ts: int, weight: int) -> None:
+        joined = datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts else ""
+        winner = uid in self.winner_ids
+        if self._csv is not None:
+            self._csv.writerow([uid, joined, weight, "yes" if winner else "no"])
+        else:
+            self._text.write(json.dumps({"user_id": uid, "joined_at": joined, "weight": weight, "winner": winner}, separators=(",", ":")) + "\n")
+        self.rows += 1
+
+    def write_many(self, rows) -> None:
+        for row in rows:
+            try:
+                uid = int(row[0])
+                ts = int(row[1]) if len(row) > 1 else 0
+                weight = int(row[2]) if len(row) > 2 else 1
+            except Exception:
+                continue
+            self.write(uid, ts, weight)
+
+    def finish(self) -> int:
+        self._text.flush()
+        self._text.detach()
+        self._gz.close()
+        size = self.file.tell()
+        self.file.seek(0)
+        return size
+
+    def close(self) -> None:
+        self.file.close()
@@ -0,0 +1,104 @@
+import bisect
+import heapq
+from typing import Any, Iterable, Iterator
+
+STATUS_ACTIVE = "active"
+STATUS_ENDED = "ended"
+STATUS_ARCHIVED = "archived"
+STATUSES = (STATUS_ACTIVE, STATUS_ENDED, STATUS_ARCHIVED)
+
+
+def _to_int(v, default=0) -> int:
+    try:
+        return int(v)
+    except Exception:
+        return default
+
+
+class Summary:
+    __slots__ = ("giveaway_id", "guild_id", "channel_id", "prize", "end_ts", "status", "_search")
+
+    def __init__(self, giveaway_id: str, guild_id: int, channel_id: int, prize: str, end_ts: int, status: str):
+        self.giveaway_id = giveaway_id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.prize = prize
+        self.end_ts = end_ts
+        self.status = status
+        self._search = f"{giveaway_id} {prize}".lower()
+
+    def matches(self, text: str) -> bool:
+        return not text or text in self._search
+
+
+def summary_fields(gw: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "guild_id": _to_int(gw.get("guild_id", 0), 0),
+        "channel_id": _to_int(gw.get("channel_id", 0), 0),
+        "prize": str(gw.get("prize", "Unknown")),
+        "end_ts": _to_int(gw.get("end_ts", 0), 0),
+    }
+
+
+class GiveawayIndex:
+    def __init__(self):
+        self._items: dict[str, Summary] = {}
+        self._buckets: dict[tuple[int, str], list[tuple[int, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, giveaway_id: str) -> Summary | None:
+        return self._items.get(giveaway_id)
+
+    def update(self, giveaway_id: str, gw: dict[str, Any], status: str) -> None:
+        f = summary_fields(gw)
+        prev = self._items.get(giveaway_id)
+        if prev is not None:
+            if (prev.guild_id, prev.end_ts, prev.status, prev.prize) == (f["guild_id"], f["end_ts"], status, f["prize"]):
+                return
+            self.remove(giveaway_id)
+        s = Summary(giveaway_id, f["guild_id"], f["channel_id"], f["prize"], f["end_ts"], status)
+        self._items[giveaway_id] = s
+        bisect.insort(self._buckets.setdefault((s.guild_id, status), []), (s.end_ts, giveaway_id))
+
+    def remove(self, giveaway_id: str) -> None:
+        s = self._items.pop(giveaway_id, None)
+        if s is None:
+            return
+        bucket = self._buckets.get((s.guild_id, s.status))
+        if not bucket:
+            return
+        key = (s.end_ts, giveaway_id)
+        i = bisect.bisect_left(bucket, key)
+        if i < len(bucket) and bucket[i] == key:
+            del bucket[i]
+        if not bucket:
+            del self._buckets[(s.guild_id, s.status)]
+
+    def count(self, guild_id: int | None, status: str) -> int:
+        if guild_id is not None:
+            return len(self._buckets.get((guild_id, status), ()))
+        return sum(len(b) for (g, st), b in self._buckets.items() if st == status)
+
+    def _ordered(self, guild_id: int | None, status: str) -> Iterator[tuple[int, str]]:
+        newest_first = status != STATUS_ACTIVE
+        if guild_id is not None:
+            bucket = self._buckets.get((guild_id, status), [])
+            return reversed(bucket) if newest_first else iter(bucket)
+        buckets = [b for (g, st), b in self._buckets.items() if st == status]
+        if newest_first:
+            return heapq.merge(*[reversed(b) for b in buckets], reverse=True)
+        return heapq.merge(*buckets)
+
+    def query(self, guild_id: int | None, statuses: Iterable[str], limit: int, text: str = "") -> list[Summary]:
+        text = text.strip().lower()
+        out: list[Summary] = []
+        for status in statuses:
+            for _, gid in self._ordered(guild_id, status):
+                s = self._items[gid]
+                if s.matches(text):
+                    out.append(s)
+                    if len(out) >= limit:
+                        return out
+        return out
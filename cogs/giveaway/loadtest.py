@@ -0,0 +1,233 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import discord
+
+from . import module
+from .module import GiveawayJoinView
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "config.json")
+DEADLINE_MS = 3000.0
+
+
+class FakeRest:
+    def __init__(self, latency_ms: float, jitter_ms: float, rate_429: float, retry_after_ms: float, seed: int):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.rate_429 = rate_429
+        self.retry_after = retry_after_ms / 1000
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.limited = 0
+
+    async def request(self) -> None:
+        while True:
+            self.calls += 1
+            await asyncio.sleep(max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter)))
+            if self.rng.random() >= self.rate_429:
+                return
+            self.limited += 1
+            await asyncio.sleep(self.retry_after)
+
+
+class TimedLock(asyncio.Lock):
+    def __init__(self):
+        super().__init__()
+        self.acquisitions = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    async def acquire(self):
+        start = time.perf_counter()
+        await super().acquire()
+        waited = time.perf_counter() - start
+        self.acquisitions += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        return True
+
+
+class LoadMember(discord.Member):
+    def __init__(self, uid: int):
+        self._user = SimpleNamespace(id=uid, bot=False)
+
+    @property
+    def roles(self):
+        return []
+
+
+class FakeResponse:
+    def __init__(self, rest: FakeRest):
+        self.rest = rest
+        self.done_at: float | None = None
+        self.text = ""
+
+    async def send_message(self, content=None, **kwargs):
+        await self.rest.request()
+        self.done_at = time.perf_counter()
+        self.text = str(content)
+
+    def is_done(self) -> bool:
+        return self.done_at is not None
+
+
+class FakeMessage:
+    def __init__(self, rest: FakeRest, stats: dict):
+        self.rest = rest
+        self.stats = stats
+
+    async def edit(self, **kwargs):
+        self.stats["edits"] += 1
+        await self.rest.request()
+
+
+class FakeTree:
+    def add_command(self, *args, **kwargs):
+        pass
+
+    def remove_command(self, *args, **kwargs):
+        pass
+
+
+def _load_cfg(tmpdir: str) -> dict:
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+    g = dict(cfg.get("giveaway", {}))
+    g["enabled"] = True
+    g["storage_path"] = os.path.join(tmpdir, "giveaways.json")
+    g["entries_path"] = os.path.join(tmpdir, "giveaway_entries.log")
+    g["archive"] = {"enabled": False, "path": os.path.join(tmpdir, "archive.jsonl.gz")}
+    g["join_requirements"] = {}
+    cfg["giveaway"] = g
+    cfg["guild_id"] = 0
+    return cfg
+
+
+def _percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, max(0, int(round(p / 100 * (len(values) - 1)))))
+    return values[k]
+
+
+async def run(users: int, concurrency: int, ramp_seconds: float, rest: FakeRest, double_click: float = 0.0) -> dict:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        stats = {"edits": 0, "saves": 0}
+        message = FakeMessage(rest, stats)
+        bot = SimpleNamespace(
+            cfg=_load_cfg(tmpdir),
+            log=None,
+            tree=FakeTree(),
+            add_view=lambda view: None,
+            get_partial_messageable=lambda cid, guild_id=None: SimpleNamespace(get_partial_message=lambda mid: message),
+        )
+        await module.setup(bot)
+
+        storage = bot._giveaway_storage
+        lock = TimedLock()
+        storage._lock = lock
+        save = storage.save
+
+        async def counted_save():
+            stats["saves"] += 1
+            await save()
+
+        storage.save = counted_save
+
+        gid = "1"
+        await module._save_giveaway(bot, gid, {
+            "guild_id": 1,
+            "channel_id": 1,
+            "message_id": 1,
+            "prize": "Load test",
+            "winners": 1,
+            "host_id": 1,
+            "end_ts": int(time.time()) + 3600,
+            "ended": False,
+            "winner_ids": [],
+        })
+        view = GiveawayJoinView(bot, gid)
+        guild = SimpleNamespace(id=1)
+        sem = asyncio.Semaphore(max(1, concurrency))
+        latencies: list[float] = []
+
+        async def click(uid: int, at: float):
+            await asyncio.sleep(at)
+            created = time.perf_counter()
+            interaction = SimpleNamespace(client=bot, guild=guild, user=LoadMember(uid), response=FakeResponse(rest))
+            async with sem:
+                await view._on_click(interaction)
+            done = interaction.response.done_at or time.perf_counter()
+            latencies.append((done - created) * 1000)
+
+        clicks = []
+        for i in range(users):
+            at = random.uniform(0, ramp_seconds)
+            clicks.append(click(10_000 + i, at))
+            if random.random() < double_click:
+                clicks.append(click(10_000 + i, at + random.uniform(0.0, 0.25)))
+
+        start = time.perf_counter()
+        await asyncio.gather(*clicks)
+        elapsed = time.perf_counter() - start
+
+        count = bot._giveaway_entries.count(gid)
+        stats["commits"] = bot._giveaway_entries.commits
+        await module.teardown(bot)
+
+    latencies.sort()
+    return {
+        "users": users,
+        "clicks": len(latencies),
+        "entries": count,
+        "elapsed": elapsed,
+        "latencies": latencies,
+        "misses": sum(1 for x in latencies if x > DEADLINE_MS),
+        "lock": lock,
+        "stats": stats,
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Giveaway join-burst load test.")
+    p.add_argument("--users", type=int, default=5000)
+    p.add_argument("--concurrency", type=int, default=500)
+    p.add_argument("--ramp", type=float, default=2.0, help="Seconds over which clicks arrive")
+    p.add_argument("--latency-ms", type=float, default=80.0)
+    p.add_argument("--jitter-ms", type=float, default=40.0)
+    p.add_argument("--rate-429", type=float, default=0.02)
+    p.add_argument("--retry-after-ms", type=float, default=500.0)
+    p.add_argument("--double-click", type=float, default=0.1, help="Fraction of users who click twice within 250 ms")
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+
+    random.seed(args.seed)
+    rest = FakeRest(args.latency_ms, args.jitter_ms, args.rate_429, args.retry_after_ms, args.seed)
+    r = asyncio.run(run(args.users, args.concurrency, args.ramp, rest, args.double_click))
+
+    lat = r["latencies"]
+    lock: TimedLock = r["lock"]
+    stats = r["stats"]
+    print(f"joins | users={r['users']} | clicks={r['clicks']} | entries={r['entries']} | elapsed={r['elapsed']:.2f}s | throughput={r['users'] / r['elapsed']:.0f}/s")
+    print(
+        f"latency | p50={_percentile(lat, 50):.0f}ms | p90={_percentile(lat, 90):.0f}ms | p99={_percentile(lat, 99):.0f}ms | "
+        f"max={lat[-1] if lat else 0:.0f}ms | misses={r['misses']} (>{DEADLINE_MS:.0f}ms)"
+    )
+    avg_wait = lock.wait_total / lock.acquisitions * 1000 if lock.acquisitions else 0.0
+    print(f"storage_lock | acquisitions={lock.acquisitions} | wait_avg={avg_wait:.3f}ms | wait_max={lock.wait_max * 1000:.3f}ms")
+    print(f"writes | saves={stats['saves']} | entry_commits={stats['commits']} | saves_per_s={stats['saves'] / r['elapsed']:.2f}")
+    print(f"rest | calls={rest.calls} | rate_limited={rest.limited} | message_edits={stats['edits']}")
+
+    if r["misses"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
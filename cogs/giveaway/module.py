@@ -1,13 +1,21 @@
 import asyncio
 import re
-import secrets
 import time
+from contextlib import closing
 from typing import Any
 
 import discord
 from discord import app_commands
 
+from .archive import ArchiveStore
+from .eligibility import Eligibility
+from .entries import EntrySet, EntryStore
+from .export import EntrantExport
+from .notify import NotificationQueue
+from .index import STATUS_ACTIVE, STATUS_ARCHIVED, STATUS_ENDED, STATUSES, GiveawayIndex
+from .scheduler import DeadlineScheduler
 from .storage import JsonStorage
+from .updates import DebouncedEditor
 
 
 def _to_int(v, default=0) -> int:
@@ -67,6 +75,88 @@ def _tick_seconds(bot) -> int:
     return max(3, _to_int(_cfg(bot).get("tick_seconds", 10), 10))
 
 
+def _update_interval(bot) -> float:
+    try:
+        return max(0.0, float(_cfg(bot).get("entry_update_interval_seconds", 5)))
+    except Exception:
+        return 5.0
+
+
+def _archive_cfg(bot) -> dict:
+    v = _cfg(bot).get("archive", {})
+    return v if isinstance(v, dict) else {}
+
+
+def _archive_enabled(bot) -> bool:
+    return _to_bool(_archive_cfg(bot).get("enabled", True), True)
+
+
+def _archive_path(bot) -> str:
+    return str(_archive_cfg(bot).get("path", "data/giveaways_archive.jsonl.gz"))
+
+
+def _archive_retention(bot) -> int:
+    return max(0, _to_int(_archive_cfg(bot).get("retention_hours", 72), 72)) * 3600
+
+
+def _commit_delay(bot) -> float:
+    return max(0, _to_int(_cfg(bot).get("entries_commit_ms", 5), 5)) / 1000.0
+
+
+def _list_limit(bot) -> int:
+    return max(1, min(50, _to_int(_cfg(bot).get("list_limit", 20), 20)))
+
+
+def _notify_cfg(bot) -> dict:
+    v = _cfg(bot).get("notifications", {})
+    return v if isinstance(v, dict) else {}
+
+
+def _announce_enabled(bot) -> bool:
+    return _to_bool(_notify_cfg(bot).get("announce", True), True)
+
+
+def _dm_winners(bot) -> bool:
+    return _to_bool(_notify_cfg(bot).get("dm_winners", False), False)
+
+
+def _notify_text(bot, key: str, default: str, **kwargs) -> str:
+    s = _notify_cfg(bot).get(key, default)
+    s = str(s) if s is not None else default
+    try:
+        return s.format(**kwargs)
+    except Exception:
+        return default.format(**kwargs)
+
+
+def _notify_queue(bot) -> NotificationQueue:
+    c = _notify_cfg(bot)
+    try:
+        channel_interval = max(0.0, float(c.get("channel_interval_seconds", 1.0)))
+        dm_interval = max(0.0, float(c.get("dm_interval_seconds", 0.5)))
+    except Exception:
+        channel_interval, dm_interval = 1.0, 0.5
+    return NotificationQueue(
+        concurrency=max(1, _to_int(c.get("concurrency", 4), 4)),
+        max_retries=max(0, _to_int(c.get("max_retries", 3), 3)),
+        channel_interval=channel_interval,
+        dm_interval=dm_interval,
+        closed_dm_ttl=max(0, _to_int(c.get("closed_dm_ttl_hours", 168), 168)) * 3600,
+        log=getattr(bot, "log", None),
+    )
+
+
+def _export_chunk(bot) -> int:
+    return max(100, _to_int(_cfg(bot).get("export_chunk_size", 5000), 5000))
+
+
+def _dedupe_seconds(bot) -> float:
+    try:
+        return max(0.0, float(_cfg(bot).get("join_dedupe_seconds", 1.5)))
+    except Exception:
+        return 1.5
+
+
 def _default_winners(bot) -> int:
     return max(1, _to_int(_cfg(bot).get("default_winners", 1), 1))
 
@@ -170,19 +260,76 @@ def _reroll_exclude_prev(bot) -> bool:
     return _to_bool(_reroll_cfg(bot).get("exclude_previous_winners", True), True)
 
 
-def _can_join(bot, member: discord.Member) -> bool:
-    req = _req_roles(bot)
-    blk = _blacklist_roles(bot)
+def _bonus_cfg(bot) -> dict:
+    v = _cfg(bot).get("bonus_entries", {})
+    return v if isinstance(v, dict) else {}
 
-    if _block_blacklist(bot) and blk:
-        if any(r.id in blk for r in member.roles):
-            return False
 
-    if _block_missing_required(bot) and req:
-        if not any(r.id in req for r in member.roles):
-            return False
+def _bonus_role_entries(bot) -> dict[int, int]:
+    v = _bonus_cfg(bot).get("role_entries", {})
+    if not isinstance(v, dict):
+        return {}
+    out = {}
+    for k, x in v.items():
+        rid = _to_int(k, 0)
+        n = _to_int(x, 0)
+        if rid > 0 and n > 1:
+            out[rid] = n
+    return out
 
-    return True
+
+def _bonus_levels_per_entry(bot) -> int:
+    v = _bonus_cfg(bot).get("leveling", {})
+    if not isinstance(v, dict) or not _to_bool(v.get("enabled", False), False):
+        return 0
+    return max(0, _to_int(v.get("levels_per_entry", 10), 10))
+
+
+def _bonus_max_entries(bot) -> int:
+    return max(1, _to_int(_bonus_cfg(bot).get("max_entries", 10), 10))
+
+
+def _entry_weight(bot, member: discord.Member) -> int:
+    if not _to_bool(_bonus_cfg(bot).get("enabled", False), False):
+        return 1
+
+    weight = 1
+    for rid, n in _bonus_role_entries(bot).items():
+        if n > weight and member.get_role(rid) is not None:
+            weight = n
+
+    per_level = _bonus_levels_per_entry(bot)
+    service = getattr(bot, "leveling_service", None)
+    if per_level and service is not None:
+        weight += service.cached_level(member.id) // per_level
+
+    return min(weight, _bonus_max_entries(bot))
+
+
+def _default_requirements(bot) -> dict[str, Any]:
+    c = _join_req_cfg(bot)
+    return {
+        "required_role_ids": sorted(_req_roles(bot)) if _block_missing_required(bot) else [],
+        "blacklist_role_ids": sorted(_blacklist_roles(bot)) if _block_blacklist(bot) else [],
+        "min_level": max(0, _to_int(c.get("min_level", 0), 0)),
+        "min_account_age_seconds": max(0, _to_int(c.get("min_account_age_days", 0), 0)) * 86400,
+        "min_member_seconds": max(0, _to_int(c.get("min_server_days", 0), 0)) * 86400,
+    }
+
+
+def _rules(bot, giveaway_id: str, gw: dict[str, Any]) -> Eligibility:
+    cache: dict[str, Eligibility] = bot._giveaway_rules
+    rules = cache.get(giveaway_id)
+    if rules is None:
+        req = gw.get("requirements")
+        rules = Eligibility.from_dict(req if isinstance(req, dict) else _default_requirements(bot), _join_error(bot))
+        cache[giveaway_id] = rules
+    return rules
+
+
+def _level_of(bot):
+    service = getattr(bot, "leveling_service", None)
+    return service.cached_level if service is not None else None
 
 
 def _make_embed(prize: str, winners: int, host_id: int, end_ts: int, entries: int, ended: bool, winner_ids: list[int] | None) -> discord.Embed:
@@ -201,12 +348,8 @@ def _make_embed(prize: str, winners: int, host_id: int, end_ts: int, entries: in
     return embed
 
 
-def _pick_winners(entries: list[int], count: int) -> list[int]:
-    unique = list(dict.fromkeys([int(x) for x in entries if int(x) > 0]))
-    if not unique:
-        return []
-    secrets.SystemRandom().shuffle(unique)
-    return unique[:count]
+def _pick_winners(entries: EntrySet, count: int, exclude: set[int] | None = None) -> list[int]:
+    return entries.sample(count, exclude)
 
 
 class GiveawayJoinView(discord.ui.View):
@@ -226,30 +369,76 @@ class GiveawayJoinView(discord.ui.View):
         await handle_join(interaction, self.giveaway_id)
 
 
-async def _edit_message(bot: discord.Client, guild_id: int, channel_id: int, message_id: int, embed: discord.Embed, ended: bool, giveaway_id: str):
-    guild = bot.get_guild(guild_id)
-    if guild is None:
-        try:
-            guild = await bot.fetch_guild(guild_id)
-        except Exception:
-            return
+async def _edit_message(bot: discord.Client, guild_id: int, channel_id: int, message_id: int, embed: discord.Embed, ended: bool):
+    channel = bot.get_partial_messageable(channel_id, guild_id=guild_id or None)
+    msg = channel.get_partial_message(message_id)
+    if ended:
+        await msg.edit(embed=embed, view=None)
+    else:
+        await msg.edit(embed=embed)
 
-    channel = guild.get_channel(channel_id)
-    if channel is None:
-        try:
-            channel = await guild.fetch_channel(channel_id)
-        except Exception:
-            return
 
-    try:
-        msg = await channel.fetch_message(message_id)
-    except Exception:
+async def _update_entry_count(bot: discord.Client, giveaway_id: str):
+    storage: JsonStorage = bot._giveaway_storage
+    gw = await storage.get(giveaway_id)
+    if not gw or _to_bool(gw.get("ended", False), False):
         return
 
-    view = None
-    if not ended:
-        view = GiveawayJoinView(bot, giveaway_id)
-    await msg.edit(embed=embed, view=view)
+    embed = _make_embed(
+        str(gw.get("prize", "Unknown")),
+        _to_int(gw.get("winners", 1), 1),
+        _to_int(gw.get("host_id", 0), 0),
+        _to_int(gw.get("end_ts", 0), 0),
+        bot._giveaway_entries.count(giveaway_id),
+        False,
+        None,
+    )
+    await _edit_message(
+        bot,
+        _to_int(gw.get("guild_id", 0), 0),
+        _to_int(gw.get("channel_id", 0), 0),
+        _to_int(gw.get("message_id", 0), 0),
+        embed,
+        False,
+    )
+
+
+def _notify_winners(bot: discord.Client, giveaway_id: str, gw: dict[str, Any], winner_ids: list[int], reroll: bool = False):
+    queue: NotificationQueue = bot._giveaway_notify
+    guild_id = _to_int(gw.get("guild_id", 0), 0)
+    channel_id = _to_int(gw.get("channel_id", 0), 0)
+    message_id = _to_int(gw.get("message_id", 0), 0)
+    prize = str(gw.get("prize", "Unknown"))
+    link = f"https://discord.com/channels/{guild_id}/{channel_id}/{message_id}"
+    mentions = " ".join([f"<@{i}>" for i in winner_ids])
+    label = f"giveaway={giveaway_id}"
+
+    if _announce_enabled(bot) and channel_id:
+        if not winner_ids:
+            text = _notify_text(bot, "no_winners_message", "No valid entries for **{prize}**.", prize=prize, link=link)
+        elif reroll:
+            text = _notify_text(bot, "reroll_message", "New winner(s) for **{prize}**: {winners}!", prize=prize, winners=mentions, link=link)
+        else:
+            text = _notify_text(bot, "announce_message", "Congratulations {winners}! You won **{prize}**.", prize=prize, winners=mentions, link=link)
+        channel = bot.get_partial_messageable(channel_id, guild_id=guild_id or None)
+        queue.announce(channel, channel_id, text, label)
+
+    if _dm_winners(bot):
+        guild = bot.get_guild(guild_id)
+        server = guild.name if guild is not None else "the server"
+        for uid in winner_ids:
+            text = _notify_text(bot, "dm_message", "You won **{prize}** in {server}! {link}", prize=prize, server=server, link=link)
+            queue.dm(bot, uid, text, label)
+
+
+def _status(gw: dict[str, Any]) -> str:
+    return STATUS_ENDED if _to_bool(gw.get("ended", False), False) else STATUS_ACTIVE
+
+
+async def _save_giveaway(bot: discord.Client, giveaway_id: str, gw: dict[str, Any]):
+    storage: JsonStorage = bot._giveaway_storage
+    await storage.set(giveaway_id, gw)
+    bot._giveaway_index.update(giveaway_id, gw, _status(gw))
 
 
 async def _end_giveaway(bot: discord.Client, giveaway_id: str, force: bool = False) -> list[int]:
@@ -270,24 +459,61 @@ async def _end_giveaway(bot: discord.Client, giveaway_id: str, force: bool = Fal
     host_id = _to_int(gw.get("host_id", 0), 0)
     end_ts = _to_int(gw.get("end_ts", 0), 0)
 
-    entries = gw.get("entries", [])
-    if not isinstance(entries, list):
-        entries = []
-
-    winner_ids = _pick_winners([_to_int(x, 0) for x in entries], winners)
+    entries = bot._giveaway_entries.get(giveaway_id)
+    winner_ids = _pick_winners(entries, winners)
 
     gw["ended"] = True
     gw["winner_ids"] = winner_ids
     gw["ended_ts"] = int(time.time())
-    await storage.set(giveaway_id, gw)
+    await _save_giveaway(bot, giveaway_id, gw)
+    bot._giveaway_scheduler.cancel(giveaway_id)
+    bot._giveaway_updates.cancel(giveaway_id)
+    bot._giveaway_rules.pop(giveaway_id, None)
+    _schedule_archive(bot, giveaway_id, gw["ended_ts"])
 
     embed = _make_embed(prize, winners, host_id, end_ts, len(entries), True, winner_ids)
+    if channel_id and message_id:
+        channel = bot.get_partial_messageable(channel_id, guild_id=guild_id or None)
+        bot._giveaway_notify.edit(channel.get_partial_message(message_id), channel_id, f"giveaway={giveaway_id}", embed=embed, view=None)
+
+    _notify_winners(bot, giveaway_id, gw, winner_ids)
+    return winner_ids
+
+
+async def _toggle_entry(bot: discord.Client, member: discord.Member, giveaway_id: str) -> str:
+    summary = bot._giveaway_index.get(giveaway_id)
+    if summary is None or summary.status == STATUS_ARCHIVED:
+        return "This giveaway no longer exists."
+    if summary.status != STATUS_ACTIVE:
+        return "This giveaway already ended."
+
+    entries: EntryStore = bot._giveaway_entries
+    if member.id not in entries.get(giveaway_id):
+        rules = bot._giveaway_rules.get(giveaway_id)
+        if rules is None:
+            rules = _rules(bot, giveaway_id, await bot._giveaway_storage.get(giveaway_id) or {})
+        level_of = _level_of(bot)
+        if rules.min_level and level_of is None and not getattr(bot, "_giveaway_level_warned", False):
+            bot._giveaway_level_warned = True
+            log = getattr(bot, "log", None)
+            if log:
+                log.warning(f"giveaway_min_level_skipped | giveaway={giveaway_id} | min_level={rules.min_level} | reason=leveling_service_missing")
+        error = rules.check(member, level_of)
+        if error:
+            return error
+
+    joined = entries.toggle(giveaway_id, member.id, _entry_weight(bot, member))
+    bot._giveaway_updates.touch(giveaway_id)
     try:
-        await _edit_message(bot, guild_id, channel_id, message_id, embed, True, giveaway_id)
+        await entries.sync()
     except Exception:
-        pass
+        return "Your entry could not be saved right now. It will be retried shortly."
+    return "You joined the giveaway." if joined else "You left the giveaway."
 
-    return winner_ids
+
+def _expire_inflight(inflight: dict, key: tuple[str, int], fut: asyncio.Future):
+    if inflight.get(key) is fut:
+        del inflight[key]
 
 
 async def handle_join(interaction: discord.Interaction, giveaway_id: str):
@@ -302,83 +528,107 @@ async def handle_join(interaction: discord.Interaction, giveaway_id: str):
         await interaction.response.send_message("This is only available in a server.", ephemeral=True)
         return
 
-    if not _can_join(bot, interaction.user):
-        await interaction.response.send_message(_join_error(bot), ephemeral=True)
+    inflight: dict[tuple[str, int], asyncio.Future] = bot._giveaway_inflight
+    key = (giveaway_id, interaction.user.id)
+    fut = inflight.get(key)
+    if fut is not None:
+        try:
+            text = await asyncio.shield(fut)
+        except Exception:
+            text = "Something went wrong, please try again."
+        await interaction.response.send_message(text, ephemeral=True)
         return
 
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+    inflight[key] = fut
+    try:
+        text = await _toggle_entry(bot, interaction.user, giveaway_id)
+        fut.set_result(text)
+    except BaseException as e:
+        fut.set_exception(e if isinstance(e, Exception) else RuntimeError("join cancelled"))
+        fut.exception()
+        _expire_inflight(inflight, key, fut)
+        raise
+    loop.call_later(_dedupe_seconds(bot), _expire_inflight, inflight, key, fut)
+    await interaction.response.send_message(text, ephemeral=True)
+
+
+def _schedule_archive(bot: discord.Client, giveaway_id: str, ended_ts: int):
+    if _archive_enabled(bot):
+        bot._giveaway_scheduler.schedule(f"archive:{giveaway_id}", ended_ts + _archive_retention(bot))
+
+
+async def _archive_giveaway(bot: discord.Client, giveaway_id: str):
     storage: JsonStorage = bot._giveaway_storage
     gw = await storage.get(giveaway_id)
-    if not gw:
-        await interaction.response.send_message("This giveaway no longer exists.", ephemeral=True)
+    if not gw or not _to_bool(gw.get("ended", False), False):
         return
-    if _to_bool(gw.get("ended", False), False):
-        await interaction.response.send_message("This giveaway already ended.", ephemeral=True)
+
+    entries: EntryStore = bot._giveaway_entries
+    archive: ArchiveStore = bot._giveaway_archive
+    log = getattr(bot, "log", None)
+    if giveaway_id in archive:
+        bot._giveaway_index.update(giveaway_id, archive.summaries.get(giveaway_id, gw), STATUS_ARCHIVED)
+        await storage.delete(giveaway_id)
+        entries.drop(giveaway_id)
+        bot._giveaway_updates.cancel(giveaway_id)
+        if log:
+            log.info(f"giveaway_archive_skipped | giveaway={giveaway_id} | reason=already_archived")
         return
 
-    uid = interaction.user.id
-    entries = gw.get("entries", [])
-    if not isinstance(entries, list):
-        entries = []
+    record = dict(gw)
+    record["entries"] = [[uid, ts, weight] for uid, ts, weight in entries.get(giveaway_id).items()]
+    await archive.put(giveaway_id, record)
+    bot._giveaway_index.update(giveaway_id, record, STATUS_ARCHIVED)
+    await storage.delete(giveaway_id)
+    entries.drop(giveaway_id)
+    bot._giveaway_updates.cancel(giveaway_id)
 
-    if uid in entries:
-        entries = [x for x in entries if x != uid]
-        gw["entries"] = entries
-        await storage.set(giveaway_id, gw)
-        await interaction.response.send_message("You left the giveaway.", ephemeral=True)
-    else:
-        entries.append(uid)
-        gw["entries"] = entries
-        await storage.set(giveaway_id, gw)
-        await interaction.response.send_message("You joined the giveaway.", ephemeral=True)
+    if log:
+        log.info(f"giveaway_archived | giveaway={giveaway_id} | entries={len(record['entries'])} | archived={len(archive)}")
 
-    try:
-        embed = _make_embed(
-            str(gw.get("prize", "Unknown")),
-            _to_int(gw.get("winners", 1), 1),
-            _to_int(gw.get("host_id", 0), 0),
-            _to_int(gw.get("end_ts", 0), 0),
-            len(entries),
-            False,
-            None,
-        )
-        await _edit_message(
-            bot,
-            _to_int(gw.get("guild_id", 0), 0),
-            _to_int(gw.get("channel_id", 0), 0),
-            _to_int(gw.get("message_id", 0), 0),
-            embed,
-            False,
-            giveaway_id,
-        )
-    except Exception:
-        pass
+
+async def _fire(bot: discord.Client, giveaway_id: str) -> bool:
+    if giveaway_id.startswith("archive:"):
+        await _archive_giveaway(bot, giveaway_id[8:])
+        return True
+    if not _enabled(bot):
+        return False
+    await _end_giveaway(bot, giveaway_id)
+    return True
 
 
 async def _runner(bot: discord.Client):
-    while True:
-        await asyncio.sleep(_tick_seconds(bot))
-        if not _enabled(bot):
-            continue
-        storage: JsonStorage = bot._giveaway_storage
-        all_gw = await storage.all()
-        now = int(time.time())
-        for gid, gw in all_gw.items():
-            try:
-                if _to_bool(gw.get("ended", False), False):
-                    continue
-                end_ts = _to_int(gw.get("end_ts", 0), 0)
-                if end_ts > 0 and now >= end_ts:
-                    await _end_giveaway(bot, gid)
-            except Exception:
-                continue
+    scheduler: DeadlineScheduler = bot._giveaway_scheduler
+    await scheduler.run(lambda gid: _fire(bot, gid), retry_seconds=_tick_seconds(bot))
 
 
 giveaway_group = app_commands.Group(name="giveaway", description="Giveaway commands.")
 
 
 @giveaway_group.command(name="start", description="Start a giveaway.")
-@app_commands.describe(duration="Example: 10m, 2h, 1d", prize="Prize text", winners="Number of winners", channel="Channel to post in")
-async def giveaway_start(interaction: discord.Interaction, duration: str, prize: str, winners: int | None = None, channel: discord.TextChannel | None = None):
+@app_commands.describe(
+    duration="Example: 10m, 2h, 1d",
+    prize="Prize text",
+    winners="Number of winners",
+    channel="Channel to post in",
+    min_level="Minimum leveling level to join",
+    account_age="Minimum account age, e.g. 7d",
+    server_age="Minimum time in this server, e.g. 1d",
+    required_role="Role required to join",
+)
+async def giveaway_start(
+    interaction: discord.Interaction,
+    duration: str,
+    prize: str,
+    winners: int | None = None,
+    channel: discord.TextChannel | None = None,
+    min_level: int | None = None,
+    account_age: str | None = None,
+    server_age: str | None = None,
+    required_role: discord.Role | None = None,
+):
     bot = interaction.client
     if not _enabled(bot):
         await interaction.response.send_message("Giveaways are disabled.", ephemeral=True)
@@ -412,6 +662,17 @@ async def giveaway_start(interaction: discord.Interaction, duration: str, prize:
         await interaction.response.send_message("Invalid channel.", ephemeral=True)
         return
 
+    req = _default_requirements(bot)
+    if min_level is not None:
+        req["min_level"] = max(0, int(min_level))
+    if account_age:
+        req["min_account_age_seconds"] = _parse_duration_to_seconds(account_age)
+    if server_age:
+        req["min_member_seconds"] = _parse_duration_to_seconds(server_age)
+    if required_role is not None:
+        req["required_role_ids"] = [required_role.id]
+    rules = Eligibility.from_dict(req, _join_error(bot))
+
     end_ts = int(time.time()) + int(secs)
     embed = _make_embed(prize, w, interaction.user.id, end_ts, 0, False, None)
 
@@ -431,11 +692,13 @@ async def giveaway_start(interaction: discord.Interaction, duration: str, prize:
         "winners": w,
         "host_id": interaction.user.id,
         "end_ts": end_ts,
-        "entries": [],
+        "requirements": rules.to_dict(),
         "ended": False,
         "winner_ids": []
     }
-    await storage.set(giveaway_id, gw)
+    bot._giveaway_rules[giveaway_id] = rules
+    await _save_giveaway(bot, giveaway_id, gw)
+    bot._giveaway_scheduler.schedule(giveaway_id, end_ts)
 
 
 @giveaway_group.command(name="end", description="End a giveaway early.")
@@ -488,6 +751,10 @@ async def giveaway_reroll(interaction: discord.Interaction, message_id: str, win
 
     storage: JsonStorage = bot._giveaway_storage
     gw = await storage.get(gid)
+    archived = None
+    if gw is None:
+        archived = await bot._giveaway_archive.get(gid)
+        gw = archived
     if not gw or _to_int(gw.get("guild_id", 0), 0) != interaction.guild.id:
         await interaction.response.send_message("Giveaway not found.", ephemeral=True)
         return
@@ -495,35 +762,189 @@ async def giveaway_reroll(interaction: discord.Interaction, message_id: str, win
         await interaction.response.send_message("This giveaway has not ended yet.", ephemeral=True)
         return
 
-    entries = gw.get("entries", [])
-    if not isinstance(entries, list):
-        entries = []
-
     prev = gw.get("winner_ids", [])
     prev_set = set([_to_int(x, 0) for x in prev]) if isinstance(prev, list) else set()
-
-    filtered = []
-    for x in entries:
-        uid = _to_int(x, 0)
-        if uid <= 0:
-            continue
-        if _reroll_exclude_prev(bot) and uid in prev_set:
-            continue
-        filtered.append(uid)
+    exclude = prev_set if _reroll_exclude_prev(bot) else None
 
     w = winners if winners is not None else _to_int(gw.get("winners", _default_winners(bot)), _default_winners(bot))
     w = max(1, min(_max_winners(bot), int(w)))
 
-    winner_ids = _pick_winners(filtered, w)
+    if archived is not None:
+        entries = EntrySet.from_items(archived.get("entries", []))
+    else:
+        entries = bot._giveaway_entries.get(gid)
+
+    winner_ids = _pick_winners(entries, w, exclude)
     gw["winner_ids"] = winner_ids
-    await storage.set(gid, gw)
+    if archived is not None:
+        await bot._giveaway_archive.patch(gid, {"winner_ids": winner_ids})
+    else:
+        await _save_giveaway(bot, gid, gw)
 
     await interaction.response.send_message("Rerolled.", ephemeral=True)
+    _notify_winners(bot, gid, gw, winner_ids, reroll=True)
+
+
+def _list_line(bot, s) -> str:
+    if s.status == STATUS_ACTIVE:
+        when = f"ends <t:{s.end_ts}:R> | {bot._giveaway_entries.count(s.giveaway_id)} entries"
+    else:
+        when = f"ended <t:{s.end_ts}:R>"
+    return f"`{s.giveaway_id}` | **{s.prize[:60]}** | {s.status} | {when} | <#{s.channel_id}>"
+
+
+@giveaway_group.command(name="list", description="List giveaways.")
+@app_commands.describe(status="Which giveaways to show", all_servers="Include giveaways from every server")
+@app_commands.choices(status=[
+    app_commands.Choice(name="Active", value=STATUS_ACTIVE),
+    app_commands.Choice(name="Ended", value=STATUS_ENDED),
+    app_commands.Choice(name="Archived", value=STATUS_ARCHIVED),
+    app_commands.Choice(name="All", value="all"),
+])
+async def giveaway_list(interaction: discord.Interaction, status: str = STATUS_ACTIVE, all_servers: bool = False):
+    bot = interaction.client
+    if not _enabled(bot):
+        await interaction.response.send_message("Giveaways are disabled.", ephemeral=True)
+        return
+    if interaction.guild is None or not isinstance(interaction.user, discord.Member):
+        await interaction.response.send_message("This command is only available in a server.", ephemeral=True)
+        return
+    if not _is_allowed_to_start(bot, interaction.user):
+        await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+        return
+
+    index: GiveawayIndex = bot._giveaway_index
+    guild_id = None if all_servers else interaction.guild.id
+    statuses = STATUSES if status == "all" else (status,)
+    limit = _list_limit(bot)
+    items = index.query(guild_id, statuses, limit)
+    total = sum(index.count(guild_id, st) for st in statuses)
+    if not items:
+        await interaction.response.send_message("No giveaways found.", ephemeral=True)
+        return
+
+    lines = [_list_line(bot, s) for s in items]
+    if total > len(items):
+        lines.append(f"Showing {len(items)} of {total}.")
+    await interaction.response.send_message("\n".join(lines)[:2000], ephemeral=True)
+
+
+def _choices(bot, guild_id: int, statuses: tuple[str, ...], current: str) -> list[app_commands.Choice[str]]:
+    index: GiveawayIndex = bot._giveaway_index
+    out = []
+    for s in index.query(guild_id, statuses, 25, current):
+        name = f"{s.prize[:60]} | {s.status} | {s.giveaway_id}"
+        out.append(app_commands.Choice(name=name[:100], value=s.giveaway_id))
+    return out
+
+
+@giveaway_end.autocomplete("message_id")
+async def _end_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+    if interaction.guild is None:
+        return []
+    return _choices(interaction.client, interaction.guild.id, (STATUS_ACTIVE,), current)
+
+
+@giveaway_reroll.autocomplete("message_id")
+async def _reroll_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+    if interaction.guild is None:
+        return []
+    return _choices(interaction.client, interaction.guild.id, (STATUS_ENDED, STATUS_ARCHIVED), current)
+
+
+def _export_archived(archive: ArchiveStore, giveaway_id: str, fmt: str) -> EntrantExport | None:
+    stream = archive.stream(giveaway_id)
+    header = next(stream, None) if stream is not None else None
+    if header is None:
+        return None
+    prev = header.get("winner_ids", [])
+    export = EntrantExport(fmt, set([_to_int(x, 0) for x in prev]) if isinstance(prev, list) else set())
+    export.write_many(stream)
+    return export
+
+
+@giveaway_group.command(name="export", description="Export giveaway entrants as a compressed file.")
+@app_commands.describe(message_id="Giveaway message ID", file_format="File format")
+@app_commands.rename(file_format="format")
+@app_commands.choices(file_format=[
+    app_commands.Choice(name="CSV", value="csv"),
+    app_commands.Choice(name="JSON Lines", value="jsonl"),
+])
+async def giveaway_export(interaction: discord.Interaction, message_id: str, file_format: str = "csv"):
+    bot = interaction.client
+    if not _enabled(bot):
+        await interaction.response.send_message("Giveaways are disabled.", ephemeral=True)
+        return
+    if interaction.guild is None or not isinstance(interaction.user, discord.Member):
+        await interaction.response.send_message("This command is only available in a server.", ephemeral=True)
+        return
+    if not _is_allowed_to_start(bot, interaction.user):
+        await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+        return
+
+    gid = str(_to_int(message_id, 0))
+    summary = bot._giveaway_index.get(gid)
+    if summary is None or summary.guild_id != interaction.guild.id:
+        await interaction.response.send_message("Giveaway not found.", ephemeral=True)
+        return
+
+    await interaction.response.defer(ephemeral=True, thinking=True)
+
+    export = None
+    try:
+        if summary.status == STATUS_ARCHIVED:
+            export = await asyncio.to_thread(_export_archived, bot._giveaway_archive, gid, file_format)
+        else:
+            gw = await bot._giveaway_storage.get(gid)
+            if gw:
+                prev = gw.get("winner_ids", [])
+                export = EntrantExport(file_format, set([_to_int(x, 0) for x in prev]) if isinstance(prev, list) else set())
+                with closing(bot._giveaway_entries.get(gid).snapshot(_export_chunk(bot))) as chunks:
+                    for chunk in chunks:
+                        export.write_many(chunk)
+                        await asyncio.sleep(0)
+
+        if export is None:
+            await interaction.followup.send("Giveaway not found.", ephemeral=True)
+            return
+
+        size = export.finish()
+        if size > interaction.guild.filesize_limit:
+            await interaction.followup.send(f"The export is {size // 1024} KiB, which is over this server's upload limit.", ephemeral=True)
+            return
+
+        filename = f"giveaway-{gid}-entrants{export.filename_suffix}"
+        await interaction.followup.send(f"{export.rows} entrant(s).", file=discord.File(export.file, filename=filename), ephemeral=True)
+    except Exception as e:
+        log = getattr(bot, "log", None)
+        if log:
+            log.exception(f"giveaway_export_error | giveaway={gid} | {e}")
+        await interaction.followup.send("Export failed.", ephemeral=True)
+    finally:
+        if export is not None:
+            export.close()
+
+
+@giveaway_export.autocomplete("message_id")
+async def _export_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+    if interaction.guild is None:
+        return []
+    return _choices(interaction.client, interaction.guild.id, STATUSES, current)
 
 
 async def setup(bot: discord.Client):
     path = str(_cfg(bot).get("storage_path", "data/giveaways.json"))
     bot._giveaway_storage = JsonStorage(path, log=getattr(bot, "log", None))
+    bot._giveaway_scheduler = DeadlineScheduler(log=getattr(bot, "log", None))
+    bot._giveaway_rules = {}
+    bot._giveaway_inflight = {}
+    bot._giveaway_index = GiveawayIndex()
+    bot._giveaway_notify = _notify_queue(bot)
+    bot._giveaway_notify.start()
+    entries_path = str(_cfg(bot).get("entries_path", "data/giveaway_entries.log"))
+    bot._giveaway_entries = EntryStore(entries_path, log=getattr(bot, "log", None), commit_delay=_commit_delay(bot))
+    bot._giveaway_archive = ArchiveStore(_archive_path(bot), log=getattr(bot, "log", None))
+    bot._giveaway_updates = DebouncedEditor(lambda gid: _update_entry_count(bot, gid), _update_interval(bot), log=getattr(bot, "log", None))
 
     guild_id = int(getattr(bot, "cfg", {}).get("guild_id", 0) or 0)
     guild_obj = discord.Object(id=guild_id) if guild_id else None
@@ -536,8 +957,24 @@ async def setup(bot: discord.Client):
     try:
         all_gw = await bot._giveaway_storage.all()
         for gid, gw in all_gw.items():
+            legacy = gw.pop("entries", None)
+            if isinstance(legacy, list):
+                if not bot._giveaway_entries.has(str(gid)):
+                    bot._giveaway_entries.import_legacy(str(gid), legacy)
+                await bot._giveaway_storage.set(str(gid), gw)
+            bot._giveaway_index.update(str(gid), gw, _status(gw))
             if not _to_bool(gw.get("ended", False), False):
                 bot.add_view(GiveawayJoinView(bot, str(gid)))
+                _rules(bot, str(gid), gw)
+                end_ts = _to_int(gw.get("end_ts", 0), 0)
+                if end_ts > 0:
+                    bot._giveaway_scheduler.schedule(str(gid), end_ts)
+            else:
+                _schedule_archive(bot, str(gid), _to_int(gw.get("ended_ts", 0), 0) or int(time.time()))
+        bot._giveaway_entries.flush()
+        for gid, summary in bot._giveaway_archive.summaries.items():
+            if gid not in all_gw:
+                bot._giveaway_index.update(gid, summary, STATUS_ARCHIVED)
     except Exception:
         pass
 
@@ -558,3 +995,18 @@ async def teardown(bot: discord.Client):
     t = getattr(bot, "_giveaway_task", None)
     if t and not t.done():
         t.cancel()
+
+    updates = getattr(bot, "_giveaway_updates", None)
+    if updates is not None:
+        updates.close()
+
+    notify = getattr(bot, "_giveaway_notify", None)
+    if notify is not None:
+        notify.close()
+
+    entries = getattr(bot, "_giveaway_entries", None)
+    if entries is not None:
+        try:
+            await entries.close()
+        except Exception:
+            pass
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+import aiohttp
+import discord
+
+
+class _Job:
+    __slots__ = ("bucket", "send", "user_id", "attempts", "label")
+
+    def __init__(self, bucket: str, send: Callable[[], Awaitable], user_id: int | None, label: str):
+        self.bucket = bucket
+        self.send = send
+        self.user_id = user_id
+        self.attempts = 0
+        self.label = label
+
+
+class NotificationQueue:
+    def __init__(
+        self,
+        concurrency: int = 4,
+        max_retries: int = 3,
+        channel_interval: float = 1.0,
+        dm_interval: float = 0.5,
+        closed_dm_ttl: float = 7 * 86400,
+        closed_dm_max: int = 50000,
+        log=None,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max(0, max_retries)
+        self.channel_interval = max(0.0, channel_interval)
+        self.dm_interval = max(0.0, dm_interval)
+        self.closed_dm_ttl = closed_dm_ttl
+        self.closed_dm_max = max(1, closed_dm_max)
+        self.log = log
+        self.sent = 0
+        self.failed = 0
+        self.skipped = 0
+        self._queue: asyncio.Queue[_Job] = asyncio.Queue()
+        self._next_at: dict[str, float] = {}
+        self._closed: OrderedDict[int, float] = OrderedDict()
+        self._workers: list[asyncio.Task] = []
+        self._retries: set[asyncio.TimerHandle] = set()
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    def close(self) -> None:
+        for t in self._workers:
+            if not t.done():
+                t.cancel()
+        self._workers = []
+        for h in self._retries:
+            h.cancel()
+        self._retries.clear()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def dm_closed(self, user_id: int) -> bool:
+        ts = self._closed.get(user_id)
+        if ts is None:
+            return False
+        if time.monotonic() - ts > self.closed_dm_ttl:
+            del self._closed[user_id]
+            return False
+        return True
+
+    def _mark_closed(self, user_id: int) -> None:
+        self._closed[user_id] = time.monotonic()
+        self._closed.move_to_end(user_id)
+        while len(self._closed) > self.closed_dm_max:
+            self._closed.popitem(last=False)
+
+    def announce(self, channel: discord.abc.Messageable, channel_id: int, content: str, label: str = "") -> None:
+        async def send():
+            await channel.send(content, allowed_mentions=discord.AllowedMentions(everyone=False, roles=False, users=True))
+
+        self._queue.put_nowait(_Job(f"channel:{channel_id}", send, None, label))
+
+    def edit(self, message: discord.PartialMessage, channel_id: int, label: str = "", **fields) -> None:
+        async def send():
+            await message.edit(**fields)
+
+        self._queue.put_nowait(_Job(f"channel:{channel_id}", send, None, label))
+
+    def dm(self, bot: discord.Client, user_id: int, content: str, label: str = "") -> None:
+        if self.dm_closed(user_id):
+            self.skipped += 1
+            return
+
+        async def send():
+            user = bot.get_user(user_id) or await bot.fetch_user(user_id)
+            await user.send(content)
+
+        self._queue.put_nowait(_Job("dm", send, user_id, label))
+
+    async def _pace(self, bucket: str) -> None:
+        interval = self.dm_interval if bucket == "dm" else self.channel_interval
+        if interval <= 0:
+            return
+        now = time.monotonic()
+        at = max(now, self._next_at.get(bucket, 0.0))
+        self._next_at[bucket] = at + interval
+        if at > now:
+            await asyncio.sleep(at - now)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._pace(job.bucket)
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                if self.log:
+                    self.log.exception(f"giveaway_notify_error | {job.label} | bucket={job.bucket} | {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: _Job) -> None:
+        try:
+            await job.send()
+            self.sent += 1
+            return
+        except discord.Forbidden as e:
+            self.failed += 1
+            if job.user_id is not None:
+                self._mark_closed(job.user_id)
+            if self.log:
+                self.log.info(f"giveaway_notify_forbidden | {job.label} | bucket={job.bucket} | {e}")
+            return
+        except discord.NotFound as e:
+            self.failed += 1
+            if self.log:
+                self.log.info(f"giveaway_notify_not_found | {job.label} | bucket={job.bucket} | {e}")
+            return
+        except discord.HTTPException as e:
+            if e.status != 429 and e.status < 500:
+                self.failed += 1
+                if self.log:
+                    self.log.warning(f"giveaway_notify_failed | {job.label} | bucket={job.bucket} | status={e.status} | {e}")
+                return
+            retry_after = float(getattr(e, "retry_after", 0) or 0)
+            self._retry(job, retry_after, e)
+        except (asyncio.TimeoutError, aiohttp.ClientError, OSError) as e:
+            self._retry(job, 0.0, e)
+
+    def _retry(self, job: _Job, retry_after: float, error: Exception) -> None:
+        job.attempts += 1
+        if job.attempts > self.max_retries:
+            self.failed += 1
+            if self.log:
+                self.log.warning(f"giveaway_notify_gave_up | {job.label} | bucket={job.bucket} | attempts={job.attempts} | {error}")
+            return
+        delay = max(retry_after, 2 ** (job.attempts - 1))
+        if retry_after > 0:
+            self._next_at[job.bucket] = max(self._next_at.get(job.bucket, 0.0), time.monotonic() + retry_after)
+        loop = asyncio.get_running_loop()
+        handle: asyncio.TimerHandle | None = None
+
+        def requeue():
+            self._retries.discard(handle)
+            self._queue.put_nowait(job)
+
+        handle = loop.call_later(delay, requeue)
+        self._retries.add(handle)
@@ -0,0 +1,81 @@
+import asyncio
+import heapq
+import time
+from typing import Awaitable, Callable
+
+
+class DeadlineScheduler:
+    def __init__(self, log=None):
+        self.log = log
+        self._heap: list[tuple[float, str]] = []
+        self._deadlines: dict[str, float] = {}
+        self._wake = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._deadlines
+
+    def next_deadline(self) -> float | None:
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+
+    def schedule(self, key: str, deadline: float) -> None:
+        prev = self._deadlines.get(key)
+        if prev == deadline:
+            return
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, key))
+        if self._heap[0] == (deadline, key):
+            self._wake.set()
+
+    def cancel(self, key: str) -> None:
+        self._deadlines.pop(key, None)
+
+    def _prune(self) -> None:
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def pop_due(self, now: float) -> list[str]:
+        out = []
+        heap = self._heap
+        while True:
+            self._prune()
+            if not heap or heap[0][0] > now:
+                return out
+            _, key = heapq.heappop(heap)
+            del self._deadlines[key]
+            out.append(key)
+
+    async def _sleep(self, timeout: float | None) -> None:
+        self._wake.clear()
+        if timeout is not None and timeout <= 0:
+            return
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run(self, fire: Callable[[str], Awaitable[bool]], retry_seconds: float = 10.0) -> None:
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None:
+                await self._sleep(None)
+                continue
+
+            delay = deadline - time.time()
+            if delay > 0:
+                await self._sleep(delay)
+                continue
+
+            for key in self.pop_due(time.time()):
+                try:
+                    done = await fire(key)
+                except Exception as e:
+                    done = True
+                    if self.log:
+                        self.log.exception(f"giveaway_scheduler_error | giveaway={key} | {e}")
+                if not done:
+                    self.schedule(key, time.time() + retry_seconds)
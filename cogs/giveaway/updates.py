@@ -0,0 +1,59 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+
+class DebouncedEditor:
+    def __init__(self, edit: Callable[[str], Awaitable[None]], interval: float = 5.0, log=None):
+        self._edit = edit
+        self.interval = max(0.0, interval)
+        self.log = log
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._last: dict[str, float] = {}
+        self._dirty: set[str] = set()
+
+    def pending(self, key: str) -> bool:
+        t = self._tasks.get(key)
+        return t is not None and not t.done()
+
+    def touch(self, key: str) -> None:
+        if self.pending(key):
+            self._dirty.add(key)
+            return
+        self._schedule(key)
+
+    def _schedule(self, key: str) -> None:
+        delay = self._last.get(key, 0.0) + self.interval - time.monotonic()
+        self._tasks[key] = asyncio.create_task(self._run(key, max(0.0, delay)))
+
+    async def _run(self, key: str, delay: float) -> None:
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._last[key] = time.monotonic()
+        self._dirty.discard(key)
+        try:
+            await self._edit(key)
+        except Exception as e:
+            if self.log:
+                self.log.warning(f"giveaway_message_update_failed | giveaway={key} | {e}")
+        finally:
+            if self._tasks.get(key) is asyncio.current_task():
+                del self._tasks[key]
+                if key in self._dirty:
+                    self._dirty.discard(key)
+                    self._schedule(key)
+
+    def cancel(self, key: str) -> None:
+        t = self._tasks.pop(key, None)
+        if t is not None and not t.done():
+            t.cancel()
+        self._last.pop(key, None)
+        self._dirty.discard(key)
+
+    def close(self) -> None:
+        for t in self._tasks.values():
+            if not t.done():
+                t.cancel()
+        self._tasks.clear()
+        self._last.clear()
+        self._dirty.clear()
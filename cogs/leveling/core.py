@@ -1,6 +1,7 @@
-import discord
 from discord.ext import commands
 
+from pipeline import MessageContext
+
 from .service import LevelingService, _to_int
 
 
@@ -10,38 +11,43 @@ class LevelingCore(commands.Cog):
         self.service = service
         self.cfg = getattr(bot, "cfg", None)
 
-    @commands.Cog.listener("on_message")
-    async def on_message(self, message: discord.Message):
+    async def cog_load(self) -> None:
+        pipeline = getattr(self.bot, "message_pipeline", None)
+        if pipeline is not None:
+            pipeline.register("leveling", self.on_message_stage, order=100)
+
+    async def cog_unload(self) -> None:
+        pipeline = getattr(self.bot, "message_pipeline", None)
+        if pipeline is not None:
+            pipeline.unregister("leveling")
+
+    async def on_message_stage(self, ctx: MessageContext) -> bool:
+        message = ctx.message
         if not self.service.enabled():
-            return
-        if message.author.bot:
-            return
+            return False
         if self.service.guild_only() and message.guild is None:
-            return
+            return False
         if message.guild is None:
-            return
-        if message.channel and message.channel.id in self.service.excluded_channels():
-            return
+            return False
+        if ctx.in_channels(self.service.excluded_channels()):
+            return False
 
         guild_id_cfg = 0
         if self.cfg is not None:
             guild_id_cfg = _to_int(self.cfg.get("guild_id", 0), 0)
         if guild_id_cfg and message.guild.id != guild_id_cfg:
-            return
+            return False
 
-        member = message.author if isinstance(message.author, discord.Member) else None
+        member = await ctx.get_member()
         if member is None:
-            try:
-                member = await message.guild.fetch_member(message.author.id)
-            except Exception:
-                return
+            return False
 
         if not self.service.passes_spam(member.id, message.content or ""):
-            return
+            return False
 
         gain = self.service.xp_per_message()
         if gain <= 0:
-            return
+            return False
 
         entry = await self.service.storage.get_entry(member.id)
         old_xp = _to_int(entry.get("xp", 0), 0)
@@ -56,3 +62,5 @@ class LevelingCore(commands.Cog):
             await self.service.apply_roles_for_level(member, new_level)
             if new_level > old_level:
                 await self.service.announce_levelup(member, new_level)
+
+        return False
@@ -248,6 +248,12 @@ class LevelingService:
             if self.log:
                 self.log.exception(f"leveling_announce_error | guild={member.guild.id} | channel={ch_id} | {e}")
 
+    def cached_level(self, user_id: int) -> int:
+        entry = self.storage.data.get(str(user_id))
+        if not isinstance(entry, dict):
+            return 0
+        return max(0, _to_int(entry.get("level", 0), 0))
+
     async def get_rank(self, user_id: int) -> tuple[int, int, int]:
         entries = await self.storage.all_entries()
         items = [(uid, v.get("xp", 0), v.get("level", 0)) for uid, v in entries.items()]
@@ -0,0 +1,162 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from .blocklist import load_index
+from .cache import VERDICT_ALLOWED, VERDICT_BLOCKED, VERDICT_DENIED, VERDICT_NONE, changed_window
+from .linkfilter import LinkFilter
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "corpus.json")
+WORST_CASE_BUDGET_MS = 5.0
+VERDICT_NAMES = {VERDICT_NONE: "none", VERDICT_ALLOWED: "allowed", VERDICT_DENIED: "denied", VERDICT_BLOCKED: "blocked"}
+
+PLAIN_MESSAGES = [
+    "hey, anyone up for a round later?",
+    "gg that was close",
+    "I pushed the notes to the shared folder, check it when you can",
+    "lol",
+    "what time is the event on friday?",
+    "check https://tenor.com/view/cat-dance-123456 it is great",
+    "new video: https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "join us at discord.gg/abcdef",
+    "meeting moved to 18:00, same channel as last week",
+    "ok " * 200,
+]
+
+SUSPICIOUS_MESSAGES = [
+    "free nitro hxxps://disc0rd-gift[.]com/claim",
+    "[https://tenor.com](https://steamcommunity-trade.ru/offer)",
+    "\uff48\uff54\uff54\uff50\uff53\uff1a\uff0f\uff0f\uff45\uff56\uff49\uff4c\uff0e\uff43\uff4f\uff4d/login",
+    "https://g\u043e\u043egle.com/auth",
+    "https://e\u200bvil\u200b.com/x",
+    "sch\u00f6nes wochenende euch allen",
+]
+
+
+def _per_message_ns(fn, messages: list[str], rounds: int, repeats: int = 5) -> float:
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for _ in range(rounds):
+            for m in messages:
+                fn(m)
+        elapsed = (time.perf_counter_ns() - start) / (rounds * len(messages))
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _worst_ms(fn, text: str, repeats: int) -> float:
+    worst = 0.0
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        fn(text)
+        worst = max(worst, (time.perf_counter_ns() - start) / 1_000_000)
+    return worst
+
+
+def _corpus_filter(corpus: dict, tmpdir: str) -> LinkFilter:
+    lf = LinkFilter(SimpleNamespace(cfg={"link_filter": {"allowed_domains": corpus.get("allowed_domains", [])}}, log=None))
+    path = os.path.join(tmpdir, "blocklist.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(corpus.get("blocklist", [])) + "\n")
+    lf._blocklist = load_index(path)
+    return lf
+
+
+def _load_corpus() -> dict:
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _adversarial_text(adv: dict) -> str:
+    return str(adv.get("prefix", "")) + str(adv.get("repeat", "")) * int(adv.get("count", 0))
+
+
+def check_corpus() -> int:
+    corpus = _load_corpus()
+    cases = corpus.get("cases", [])
+    mismatches = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        lf = _corpus_filter(corpus, tmpdir)
+        try:
+            for case in cases:
+                text = str(case.get("text", ""))
+                got = VERDICT_NAMES[lf._verdict(text)]
+                if got != case.get("verdict"):
+                    mismatches.append(f"expected={case.get('verdict')} | got={got} | {text!r}")
+            for edit in corpus.get("edits", []):
+                old, new = str(edit.get("old", "")), str(edit.get("new", ""))
+                got = VERDICT_NAMES[lf._verdict(changed_window(old, new))]
+                if got != edit.get("verdict"):
+                    mismatches.append(f"edit | expected={edit.get('verdict')} | got={got} | {old!r} -> {new!r}")
+            for adv in corpus.get("adversarial", []):
+                v = lf._verdict(_adversarial_text(adv))
+                if v not in VERDICT_NAMES:
+                    mismatches.append(f"adversarial={adv.get('name')} | got={v!r}")
+        finally:
+            lf._blocklist.close()
+    assert not mismatches, "corpus mismatches:\n  " + "\n  ".join(mismatches)
+    return len(cases) + len(corpus.get("edits", []))
+
+
+def report_timing(repeats: int = 20) -> None:
+    corpus = _load_corpus()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        lf = _corpus_filter(corpus, tmpdir)
+        try:
+            worst_case = 0.0
+            for case in corpus.get("cases", []):
+                worst_case = max(worst_case, _worst_ms(lf._verdict, str(case.get("text", "")), repeats))
+            print(f"corpus_timing | cases={len(corpus.get('cases', []))} | worst={worst_case:.3f}ms")
+
+            worst_adv = 0.0
+            for adv in corpus.get("adversarial", []):
+                text = _adversarial_text(adv)
+                ms = _worst_ms(lf._verdict, text, repeats)
+                worst_adv = max(worst_adv, ms)
+                flag = "" if ms <= WORST_CASE_BUDGET_MS else " | over target"
+                print(f"  adversarial | {adv.get('name')} | len={len(text)} | worst={ms:.3f}ms{flag}")
+            print(f"adversarial | inputs={len(corpus.get('adversarial', []))} | worst={worst_adv:.3f}ms | target={WORST_CASE_BUDGET_MS:.1f}ms")
+        finally:
+            lf._blocklist.close()
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Link filter regression corpus and normalization benchmark.")
+    p.add_argument("--check", action="store_true", help="Only run the verdict corpus; exit non-zero on any mismatch")
+    p.add_argument("--rounds", type=int, default=5000)
+    args = p.parse_args()
+
+    try:
+        cases = check_corpus()
+    except AssertionError as e:
+        print(e)
+        sys.exit(1)
+    print(f"corpus | cases={cases} | failures=0")
+    if args.check:
+        return
+
+    rounds = args.rounds
+    lf = LinkFilter(SimpleNamespace(cfg=None, log=None))
+
+    def baseline(text: str) -> bool:
+        return lf._contains_link(text)
+
+    base = _per_message_ns(baseline, PLAIN_MESSAGES, rounds)
+    stage = _per_message_ns(lf._normalize, PLAIN_MESSAGES, rounds)
+    suspicious = _per_message_ns(lf._normalize, SUSPICIOUS_MESSAGES, max(1, rounds // 10))
+
+    print(f"plain_ascii | contains_link={base:.0f}ns | normalize_stage={stage:.0f}ns | overhead={stage / base * 100:.1f}%")
+    print(f"suspicious | normalize_stage={suspicious:.0f}ns")
+    for m in SUSPICIOUS_MESSAGES:
+        print(f"  {lf._contains_link(lf._normalize(m))!s:5} | {lf._normalize(m)!r}")
+
+    report_timing()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+
+# Memory per entry: 8 bytes for the sorted hash plus bits_per_entry / 8 bytes of
+# bloom filter (10 bits -> ~1% false positives), so 100k domains take ~0.9 MB
+# and the hard cap of max_entries bounds the worst case. The compiled index is
+# written next to the source as <path>.idx and memory-mapped when possible.
+
+_MAGIC = b"KZBL0001"
+_HEADER = struct.Struct("<8sQQQQQ")
+_MAX_LABELS = 10
+
+
+def _hash(host: str) -> int:
+    return int.from_bytes(hashlib.blake2b(host.encode("utf-8", "ignore"), digest_size=8).digest(), "little")
+
+
+def _bloom_positions(h: int, bits: int, k: int):
+    h1 = h & 0xFFFFFFFF
+    h2 = (h >> 32) | 1
+    for i in range(k):
+        yield (h1 + i * h2) % bits
+
+
+def normalize_host(raw: str) -> str:
+    s = (raw or "").strip().lower()
+    if not s or s.startswith("#"):
+        return ""
+    parts = s.split()
+    if len(parts) > 1:
+        s = parts[-1] if parts[0] in ("0.0.0.0", "127.0.0.1", "::", "::1") else parts[0]
+    if "://" in s:
+        s = s.split("://", 1)[1]
+    s = s.split("/", 1)[0].split(":", 1)[0].strip(".")
+    if s.startswith("*."):
+        s = s[2:]
+    if s.startswith("www."):
+        s = s[4:]
+    return s
+
+
+def host_suffixes(host: str) -> list[str]:
+    labels = host.split(".")
+    if len(labels) > _MAX_LABELS:
+        labels = labels[-_MAX_LABELS:]
+    return [".".join(labels[i:]) for i in range(len(labels) - 1)] or [host]
+
+
+def _signature(path: str) -> tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class BlocklistIndex:
+    def __init__(self, hashes, bloom, bloom_bits: int, k: int, signature: tuple[int, int], mapped=None):
+        self.hashes = hashes
+        self.bloom = bloom
+        self.bloom_bits = bloom_bits
+        self.k = k
+        self.signature = signature
+        self._mapped = mapped
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    @property
+    def is_mapped(self) -> bool:
+        return self._mapped is not None
+
+    def nbytes(self) -> int:
+        return len(self.hashes) * 8 + len(self.bloom)
+
+    def _has_hash(self, h: int) -> bool:
+        bloom = self.bloom
+        for pos in _bloom_positions(h, self.bloom_bits, self.k):
+            if not bloom[pos >> 3] & (1 << (pos & 7)):
+                return False
+        i = bisect_left(self.hashes, h)
+        return i < len(self.hashes) and self.hashes[i] == h
+
+    def contains(self, host: str) -> bool:
+        if not host or not self.hashes:
+            return False
+        for s in host_suffixes(host):
+            if self._has_hash(_hash(s)):
+                return True
+        return False
+
+    def close(self) -> None:
+        if self._mapped is None:
+            return
+        try:
+            self.hashes.release()
+            self.bloom.release()
+            self._mapped.close()
+        except Exception:
+            pass
+        self._mapped = None
+
+
+def _build(path: str, bits_per_entry: int, max_entries: int) -> tuple[array, bytearray, int, int]:
+    hashes = array("Q")
+    seen = set()
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            host = normalize_host(line)
+            if not host:
+                continue
+            h = _hash(host)
+            if h in seen:
+                continue
+            seen.add(h)
+            hashes.append(h)
+            if len(hashes) >= max_entries:
+                break
+    del seen
+    hashes = array("Q", sorted(hashes))
+
+    bloom_bits = max(64, len(hashes) * bits_per_entry)
+    bloom_bits = (bloom_bits + 63) // 64 * 64
+    k = max(1, min(16, round(bits_per_entry * 0.693)))
+    bloom = bytearray(bloom_bits // 8)
+    for h in hashes:
+        for pos in _bloom_positions(h, bloom_bits, k):
+            bloom[pos >> 3] |= 1 << (pos & 7)
+    return hashes, bloom, bloom_bits, k
+
+
+def _write_index(idx_path: str, hashes: array, bloom: bytearray, bloom_bits: int, k: int, signature: tuple[int, int]) -> None:
+    tmp = idx_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(hashes), bloom_bits, k, signature[0], signature[1]))
+        f.write(bloom)
+        f.write(hashes.tobytes())
+    os.replace(tmp, idx_path)
+
+
+def _map_index(idx_path: str, signature: tuple[int, int]) -> BlocklistIndex | None:
+    with open(idx_path, "rb") as f:
+        head = f.read(_HEADER.size)
+        if len(head) != _HEADER.size:
+            return None
+        magic, count, bloom_bits, k, mtime_ns, size = _HEADER.unpack(head)
+        if magic != _MAGIC or (mtime_ns, size) != signature:
+            return None
+        bloom_len = bloom_bits // 8
+        if os.fstat(f.fileno()).st_size != _HEADER.size + bloom_len + count * 8:
+            return None
+        if count == 0:
+            return BlocklistIndex(array("Q"), bytearray(bloom_len), bloom_bits, k, signature)
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mm)
+    bloom = view[_HEADER.size:_HEADER.size + bloom_len]
+    hashes = view[_HEADER.size + bloom_len:].cast("Q")
+    view.release()
+    return BlocklistIndex(hashes, bloom, bloom_bits, k, signature, mapped=mm)
+
+
+def load_index(path: str, bits_per_entry: int = 10, max_entries: int = 2_000_000) -> BlocklistIndex | None:
+    if not path or not os.path.exists(path):
+        return None
+    signature = _signature(path)
+    idx_path = path + ".idx"
+
+    try:
+        mapped = _map_index(idx_path, signature)
+        if mapped is not None:
+            return mapped
+    except Exception:
+        pass
+
+    hashes, bloom, bloom_bits, k = _build(path, bits_per_entry, max_entries)
+    try:
+        _write_index(idx_path, hashes, bloom, bloom_bits, k, signature)
+        mapped = _map_index(idx_path, signature)
+        if mapped is not None:
+            return mapped
+    except Exception:
+        pass
+    return BlocklistIndex(hashes, bloom, bloom_bits, k, signature)
+
+
+def source_signature(path: str) -> tuple[int, int] | None:
+    try:
+        return _signature(path)
+    except OSError:
+        return None
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+
+VERDICT_NONE = 0
+VERDICT_ALLOWED = 1
+VERDICT_DENIED = 2
+VERDICT_BLOCKED = 3
+
+
+class VerdictCache:
+    def __init__(self, max_entries: int = 4096, max_key_length: int = 4096):
+        self.max_entries = max(1, int(max_entries))
+        self.max_key_length = max(1, int(max_key_length))
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._data: OrderedDict[str, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def ensure_version(self, version) -> bool:
+        if version == self.version:
+            return False
+        self.version = version
+        self._data.clear()
+        self.invalidations += 1
+        return True
+
+    def get(self, key: str) -> int | None:
+        v = self._data.get(key)
+        if v is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return v
+
+    def put(self, key: str, verdict: int) -> None:
+        if len(key) > self.max_key_length:
+            return
+        self._data[key] = verdict
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def resize(self, max_entries: int) -> None:
+        self.max_entries = max(1, int(max_entries))
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+class RecentContentCache:
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max(1, int(max_entries))
+        self._data: OrderedDict[int, tuple[str, tuple[str, ...]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, message_id: int) -> tuple[str, tuple[str, ...]] | None:
+        return self._data.get(message_id)
+
+    def put(self, message_id: int, content: str, urls: tuple[str, ...] = ()) -> None:
+        self._data[message_id] = (content, urls)
+        self._data.move_to_end(message_id)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def pop(self, message_id: int) -> None:
+        self._data.pop(message_id, None)
+
+
+def _common_prefix(a: str, b: str) -> int:
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def changed_window(old: str, new: str) -> str:
+    if old == new:
+        return ""
+    p = _common_prefix(old, new)
+    q = _common_suffix(old, new, min(len(old), len(new)) - p)
+    end = len(new) - q
+
+    start = max(new.rfind(" ", 0, p), new.rfind("\n", 0, p), new.rfind("\t", 0, p)) + 1
+    stops = [i for i in (new.find(" ", end), new.find("\n", end), new.find("\t", end)) if i >= 0]
+    stop = min(stops) if stops else len(new)
+    return new[start:stop]
@@ -1,7 +1,18 @@
+import asyncio
 import re
 import discord
 from discord.ext import commands
 
+from pipeline import MessageContext
+
+from .blocklist import BlocklistIndex, load_index, source_signature
+from .cache import VERDICT_ALLOWED, VERDICT_BLOCKED, VERDICT_DENIED, VERDICT_NONE, RecentContentCache, VerdictCache, changed_window
+from .normalize import is_suspicious, normalize
+from .queue import ModerationQueue
+from .violations import ViolationTracker
+
+_HOST_RE = re.compile(r"(?i)\b(?:https?://|www\.)([a-z0-9.\-]{1,253})")
+
 
 def _to_int(v, default=0) -> int:
     try:
@@ -29,12 +40,43 @@ class LinkFilter(commands.Cog):
         self.log = getattr(bot, "log", None)
         self.url_re = re.compile(
             r"(?i)\b("
-            r"(?:https?://|www\.)\S+"
-            r"|discord\.gg/\S+"
-            r"|discord\.com/invite/\S+"
-            r"|discordapp\.com/invite/\S+"
+            r"(?:https?://|www\.)\S{1,2048}"
+            r"|discord\.gg/\S{1,2048}"
+            r"|discord\.com/invite/\S{1,2048}"
+            r"|discordapp\.com/invite/\S{1,2048}"
             r")\b"
         )
+        self._blocklist: BlocklistIndex | None = None
+        self._blocklist_task: asyncio.Task | None = None
+        self.queue = ModerationQueue(self)
+        self.verdicts = VerdictCache(self._verdict_cache_size())
+        self.recent = RecentContentCache(self._recent_cache_size())
+        self.violations = ViolationTracker(self._escalation_window(), self._escalation_max_users())
+        self._allowed = frozenset(self._allowed_domains())
+        self._policy_gen = 0
+
+    async def cog_load(self) -> None:
+        pipeline = getattr(self.bot, "message_pipeline", None)
+        if pipeline is not None:
+            pipeline.register("linkfilter", self.on_message_stage, order=10)
+        if self._blocklist_enabled():
+            await self._reload_blocklist()
+        if self._blocklist_task is None or self._blocklist_task.done():
+            self._blocklist_task = asyncio.create_task(self._blocklist_watcher())
+
+    async def cog_unload(self) -> None:
+        pipeline = getattr(self.bot, "message_pipeline", None)
+        if pipeline is not None:
+            pipeline.unregister("linkfilter")
+        if self.log:
+            self.log.info(f"linkfilter_verdict_cache_stats | {self._stats_line()}")
+        self.queue.cancel()
+        if self._blocklist_task and not self._blocklist_task.done():
+            self._blocklist_task.cancel()
+        old = self._blocklist
+        self._blocklist = None
+        if old is not None:
+            old.close()
 
     def _cfg(self) -> dict:
         if self.cfg is None:
@@ -97,32 +139,138 @@ class LinkFilter(commands.Cog):
     def _warn_message(self) -> str:
         return str(self._action_cfg().get("warn_message", "{user} links are not allowed here."))
 
-    def _has_bypass(self, member: discord.Member) -> bool:
-        bypass = self._bypass_roles()
-        if bypass and any(r.id in bypass for r in member.roles):
-            return True
+    def _warn_window(self) -> int:
+        w = max(0, _to_int(self._action_cfg().get("warn_window_seconds", 10), 10))
+        d = self._warn_delete_after()
+        return min(w, d) if d > 0 else w
+
+    def _batch_delay(self) -> float:
+        return max(0, min(5000, _to_int(self._action_cfg().get("batch_delay_ms", 500), 500))) / 1000.0
+
+    def _verdict_cache_size(self) -> int:
+        return max(1, _to_int(self._cfg().get("verdict_cache_size", 4096), 4096))
+
+    def _recent_cache_size(self) -> int:
+        return max(1, _to_int(self._cfg().get("recent_cache_size", 2048), 2048))
+
+    def _escalation_cfg(self) -> dict:
+        v = self._cfg().get("escalation", {})
+        return v if isinstance(v, dict) else {}
+
+    def _escalation_enabled(self) -> bool:
+        return _to_bool(self._escalation_cfg().get("enabled", False), False)
+
+    def _escalation_window(self) -> int:
+        return max(10, _to_int(self._escalation_cfg().get("window_seconds", 600), 600))
+
+    def _escalation_max_users(self) -> int:
+        return max(100, _to_int(self._escalation_cfg().get("max_tracked_users", 100000), 100000))
+
+    def _escalation_reason(self) -> str:
+        return str(self._escalation_cfg().get("reason", "Link filter: repeated violations"))[:512]
+
+    def _escalation_steps(self) -> list[tuple[int, int]]:
+        v = self._escalation_cfg().get("steps", [])
+        if not isinstance(v, list):
+            return []
+        out = []
+        for item in v:
+            if not isinstance(item, dict):
+                continue
+            count = _to_int(item.get("violations", 0), 0)
+            seconds = min(2419200, _to_int(item.get("timeout_seconds", 0), 0))
+            if count > 0 and seconds > 0:
+                out.append((count, seconds))
+        out.sort()
+        return out
+
+    def _blocklist_cfg(self) -> dict:
+        v = self._cfg().get("blocklist", {})
+        return v if isinstance(v, dict) else {}
+
+    def _blocklist_enabled(self) -> bool:
+        return _to_bool(self._blocklist_cfg().get("enabled", False), False)
+
+    def _blocklist_path(self) -> str:
+        return str(self._blocklist_cfg().get("path", "data/link_blocklist.txt") or "")
+
+    def _blocklist_reload_seconds(self) -> int:
+        return max(5, _to_int(self._blocklist_cfg().get("reload_seconds", 30), 30))
+
+    def _blocklist_bits_per_entry(self) -> int:
+        return max(4, min(32, _to_int(self._blocklist_cfg().get("bits_per_entry", 10), 10)))
+
+    def _blocklist_max_entries(self) -> int:
+        return max(1, _to_int(self._blocklist_cfg().get("max_entries", 2000000), 2000000))
+
+    async def _reload_blocklist(self) -> None:
+        path = self._blocklist_path()
+        try:
+            new = await asyncio.to_thread(load_index, path, self._blocklist_bits_per_entry(), self._blocklist_max_entries())
+        except Exception as e:
+            if self.log:
+                self.log.exception(f"linkfilter_blocklist_load_error | path={path} | {e}")
+            return
+
+        old = self._blocklist
+        self._blocklist = new
+        self._bump_policy()
+        if old is not None:
+            old.close()
+
+        if self.log:
+            if new is None:
+                self.log.info(f"linkfilter_blocklist_missing | path={path}")
+            else:
+                self.log.info(f"linkfilter_blocklist_loaded | path={path} | entries={len(new)} | bytes={new.nbytes()} | mmap={new.is_mapped}")
+
+    async def _blocklist_watcher(self):
+        while True:
+            await asyncio.sleep(self._blocklist_reload_seconds())
+            try:
+                if not self._blocklist_enabled():
+                    if self._blocklist is not None:
+                        old = self._blocklist
+                        self._blocklist = None
+                        self._bump_policy()
+                        old.close()
+                    continue
+                current = self._blocklist.signature if self._blocklist is not None else None
+                if source_signature(self._blocklist_path()) != current:
+                    await self._reload_blocklist()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                continue
+
+    def _is_blocklisted(self, text: str) -> bool:
+        index = self._blocklist
+        if index is None:
+            return False
+        for d in self._extract_domains(text):
+            if index.contains(d):
+                return True
         return False
 
+    def _has_bypass(self, role_ids: frozenset[int]) -> bool:
+        bypass = self._bypass_roles()
+        return bool(bypass and not bypass.isdisjoint(role_ids))
+
     def _extract_domains(self, text: str) -> set[str]:
         if not text:
             return set()
         hits = set()
-        for m in re.finditer(r"(?i)\bhttps?://([a-z0-9\.\-]+)", text):
-            host = (m.group(1) or "").lower()
-            if host.startswith("www."):
-                host = host[4:]
-            if host:
-                hits.add(host)
-        for m in re.finditer(r"(?i)\bwww\.([a-z0-9\.\-]+)", text):
-            host = (m.group(1) or "").lower()
+        for m in _HOST_RE.finditer(text):
+            host = m.group(1).lower()
             if host.startswith("www."):
                 host = host[4:]
+            host = host.strip(".-")
             if host:
                 hits.add(host)
         return hits
 
     def _is_allowed_link(self, text: str) -> bool:
-        allowed = self._allowed_domains()
+        allowed = self._allowed
         if not allowed:
             return False
         domains = self._extract_domains(text)
@@ -134,61 +282,170 @@ class LinkFilter(commands.Cog):
                     return True
         return False
 
+    def _normalize(self, text: str) -> str:
+        if not is_suspicious(text):
+            return text
+        return normalize(text)
+
     def _contains_link(self, content: str) -> bool:
         if not content:
             return False
         return self.url_re.search(content) is not None
 
-    @commands.Cog.listener("on_message")
-    async def on_message(self, message: discord.Message):
+    def _stats_line(self) -> str:
+        st = self.verdicts.stats()
+        return f"generation={self._policy_gen} | size={st['size']} | hits={st['hits']} | misses={st['misses']} | invalidations={st['invalidations']}"
+
+    def _bump_policy(self) -> None:
+        if self.log:
+            self.log.info(f"linkfilter_verdict_cache_reset | {self._stats_line()}")
+        self._policy_gen += 1
+        self.verdicts.ensure_version(self._policy_gen)
+
+    def _verdict(self, text: str) -> int:
+        text = self._normalize(text)
+        if not self._contains_link(text):
+            return VERDICT_NONE
+        if self._is_blocklisted(text):
+            return VERDICT_BLOCKED
+        if self._is_allowed_link(text):
+            return VERDICT_ALLOWED
+        return VERDICT_DENIED
+
+    def _cached_verdict(self, text: str) -> int:
+        v = self.verdicts.get(text)
+        if v is None:
+            v = self._verdict(text)
+            self.verdicts.put(text, v)
+        return v
+
+    def cache_stats(self) -> dict[str, int]:
+        return self.verdicts.stats()
+
+    def _should_scan(self, message: discord.Message) -> bool:
         if not self._enabled():
-            return
+            return False
         if message.author.bot:
-            return
+            return False
         if self._guild_only() and message.guild is None:
-            return
+            return False
         if message.guild is None:
-            return
+            return False
         if message.channel and message.channel.id in self._excluded_channels():
+            return False
+        return True
+
+    def _message_urls(self, message: discord.Message) -> tuple[str, ...]:
+        urls = [e.url for e in message.embeds or [] if e.url]
+        urls.extend(a.url for a in message.attachments or [] if a.url)
+        for snap in getattr(message, "message_snapshots", None) or []:
+            urls.append(snap.content or "")
+            urls.extend(e.url for e in snap.embeds or [] if e.url)
+            urls.extend(a.url for a in snap.attachments or [] if a.url)
+        return tuple(urls)
+
+    def _message_verdict(self, content: str, message: discord.Message) -> int:
+        verdict = self._cached_verdict(content)
+        attachments = list(message.attachments or [])
+        for e in message.embeds or []:
+            if e.url:
+                verdict = max(verdict, self._cached_verdict(e.url))
+        for snap in getattr(message, "message_snapshots", None) or []:
+            verdict = max(verdict, self._cached_verdict(snap.content or ""))
+            for e in snap.embeds or []:
+                if e.url:
+                    verdict = max(verdict, self._cached_verdict(e.url))
+            attachments.extend(snap.attachments or [])
+
+        if verdict == VERDICT_NONE and attachments:
+            for a in attachments:
+                if a.url:
+                    verdict = self._verdict(a.url)
+                    if verdict != VERDICT_NONE:
+                        break
+        return verdict
+
+    async def on_message_stage(self, ctx: MessageContext) -> bool:
+        message = ctx.message
+        if not self._should_scan(message):
+            return False
+        content = message.content or ""
+        self.recent.put(message.id, content, self._message_urls(message))
+        return await self._enforce(ctx, self._message_verdict(content, message))
+
+    @commands.Cog.listener("on_raw_message_edit")
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        message = getattr(payload, "message", None)
+        if message is None or not self._should_scan(message):
+            return
+
+        content = message.content or ""
+        urls = self._message_urls(message)
+        old = self.recent.get(message.id)
+        if old is None and payload.cached_message is not None:
+            old = (payload.cached_message.content or "", self._message_urls(payload.cached_message))
+        self.recent.put(message.id, content, urls)
+        if old == (content, urls):
             return
 
-        member = message.author if isinstance(message.author, discord.Member) else None
+        fragment = content if old is None else changed_window(old[0], content)
+        await self._enforce(MessageContext(message), self._message_verdict(fragment, message))
+
+    @commands.Cog.listener("on_raw_message_delete")
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        self.recent.pop(payload.message_id)
+
+    async def _enforce(self, ctx: MessageContext, verdict: int) -> bool:
+        if verdict == VERDICT_NONE:
+            return False
+
+        message = ctx.message
+        if verdict == VERDICT_BLOCKED:
+            if self.log:
+                self.log.info(f"linkfilter_blocklist_hit | guild={message.guild.id} | channel={message.channel.id} | user={message.author.id}")
+            self._punish(message, message.author.mention)
+            await self._escalate(ctx)
+            return True
+
+        member = await ctx.get_member()
         if member is None:
-            try:
-                member = await message.guild.fetch_member(message.author.id)
-            except Exception:
-                return
+            return False
 
-        if self._has_bypass(member):
-            return
+        if self._has_bypass(await ctx.get_role_ids()):
+            return False
 
-        text = message.content or ""
-        has_link = self._contains_link(text)
-        if not has_link and message.attachments:
-            for a in message.attachments:
-                if a.url and self._contains_link(a.url):
-                    has_link = True
-                    text = (text + " " + a.url).strip()
-                    break
+        if verdict == VERDICT_ALLOWED:
+            return False
+
+        self._punish(message, member.mention)
+        await self._escalate(ctx)
+        return True
 
-        if not has_link:
+    async def _escalate(self, ctx: MessageContext):
+        if not self._escalation_enabled():
+            return
+        steps = self._escalation_steps()
+        if not steps:
+            return
+        member = await ctx.get_member()
+        if member is None:
             return
 
-        if self._is_allowed_link(text):
+        self.violations.configure(self._escalation_window(), self._escalation_max_users())
+        count = self.violations.record(member.id)
+        level = 0
+        seconds = 0
+        for i, (threshold, secs) in enumerate(steps, start=1):
+            if count >= threshold:
+                level = i
+                seconds = secs
+        self.violations.reset_level_if_below(member.id, level)
+        if level == 0 or not self.violations.escalate(member.id, level):
             return
 
-        if self._delete_message():
-            try:
-                await message.delete()
-            except Exception:
-                return
+        if self.log:
+            self.log.info(f"linkfilter_timeout | guild={member.guild.id} | user={member.id} | violations={count} | seconds={seconds}")
+        self.queue.submit_timeout(ctx.message.channel, member, seconds, self._escalation_reason())
 
-        if self._warn_in_channel():
-            txt = self._warn_message().replace("{user}", member.mention)
-            try:
-                warn = await message.channel.send(txt)
-                d = self._warn_delete_after()
-                if d > 0:
-                    await warn.delete(delay=d)
-            except Exception:
-                return
+    def _punish(self, message: discord.Message, mention: str):
+        self.queue.submit(message, mention, self._delete_message(), self._warn_in_channel())
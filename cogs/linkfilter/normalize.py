@@ -0,0 +1,96 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+_ZERO_WIDTH = (
+    "\u00ad\u034f\u115f\u1160\u180e\u200b\u200c\u200d"
+    "\u200e\u200f\u2060\u2061\u2062\u2063\u2064\u3164\ufeff\uffa0"
+)
+_DOTS = "\u06d4\u0701\u0702\u2024\u2e33\u3002\ua4f8\ufe52\uff0e\uff61"
+_SLASHES = "\u2044\u2215\u29f8\uff0f"
+_COLONS = "\u0589\u05c3\u2236\ua789\ufe13\uff1a"
+
+_CONFUSABLES = {
+    "\u0430": "a", "\u0432": "b", "\u0435": "e", "\u043e": "o", "\u0440": "p", "\u0441": "c",
+    "\u0443": "y", "\u0445": "x", "\u0456": "i", "\u0458": "j", "\u0455": "s", "\u04bb": "h",
+    "\u0501": "d", "\u051b": "q", "\u051d": "w", "\u04cf": "l", "\u0410": "A", "\u0412": "B",
+    "\u0415": "E", "\u041a": "K", "\u041c": "M", "\u041d": "H", "\u041e": "O", "\u0420": "P",
+    "\u0421": "C", "\u0422": "T", "\u0425": "X", "\u0405": "S", "\u0406": "I", "\u0408": "J",
+    "\u03b1": "a", "\u03bf": "o", "\u03bd": "v", "\u03b9": "i", "\u03ba": "k", "\u03c1": "p",
+    "\u03c5": "u", "\u03c4": "t", "\u0391": "A", "\u0392": "B", "\u0395": "E", "\u0396": "Z",
+    "\u0397": "H", "\u0399": "I", "\u039a": "K", "\u039c": "M", "\u039d": "N", "\u039f": "O",
+    "\u03a1": "P", "\u03a4": "T", "\u03a5": "Y", "\u03a7": "X", "\u0131": "i", "\u2113": "l",
+}
+
+_STRUCTURE_TABLE = str.maketrans(
+    {
+        **{c: None for c in _ZERO_WIDTH},
+        **{c: "." for c in _DOTS},
+        **{c: "/" for c in _SLASHES},
+        **{c: ":" for c in _COLONS},
+    }
+)
+_CONFUSABLE_TABLE = str.maketrans(_CONFUSABLES)
+
+_FAST_RE = re.compile(r"(?i)hxxp|\[\.\]|\(\.\)|\{\.\}|\[dot\]|\(dot\)|\[:\]|\]\(")
+_DEFANG_RE = re.compile(r"(?i)hxxp|\[\.\]|\(\.\)|\{\.\}|\[dot\]|\(dot\)|\[:\]|\[://\]")
+_DEFANG_MAP = {"[.]": ".", "(.)": ".", "{.}": ".", "[dot]": ".", "(dot)": ".", "[:]": ":", "[://]": "://"}
+_MASKED_RE = re.compile(r"\[[^\[\]\n]{0,256}\]\(\s{0,8}<?([^\s()<>]{1,2048})>?\s{0,8}\)")
+_MAX_PUNYCODE_HOSTS = 16
+_HOST_RE = re.compile(r"(?i)(?:https?://|www\.|discord\.gg/)([^\s/?#:<>()\[\]\"']{1,253})")
+
+
+def is_suspicious(text: str) -> bool:
+    if not text:
+        return False
+    if not text.isascii():
+        return True
+    if "[" in text or "(" in text or "{" in text or "x" in text or "X" in text:
+        return _FAST_RE.search(text) is not None
+    return False
+
+
+def _defang(m: re.Match) -> str:
+    s = m.group(0)
+    low = s.lower()
+    if low == "hxxp":
+        return "http" if s[0] == "h" else "HTTP"
+    return _DEFANG_MAP.get(low, s)
+
+
+@lru_cache(maxsize=4096)
+def _punycode(host: str) -> str:
+    try:
+        return host.encode("idna").decode("ascii")
+    except Exception:
+        return host
+
+
+def normalize(text: str) -> str:
+    if not text:
+        return ""
+    base = text
+    if not base.isascii():
+        base = unicodedata.normalize("NFKC", base).translate(_STRUCTURE_TABLE)
+    base = _DEFANG_RE.sub(_defang, base)
+    base = _MASKED_RE.sub(lambda m: " " + m.group(1) + " ", base)
+    if base.isascii():
+        return base
+
+    skeleton = base.translate(_CONFUSABLE_TABLE)
+    out = []
+    last = 0
+    converted = 0
+    for m in _HOST_RE.finditer(skeleton):
+        start, end = m.span(1)
+        host = base[start:end].lower()
+        if host.isascii():
+            continue
+        out.append(skeleton[last:start])
+        if converted < _MAX_PUNYCODE_HOSTS:
+            host = _punycode(host)
+            converted += 1
+        out.append(host)
+        last = end
+    out.append(skeleton[last:])
+    return "".join(out)
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import discord
+
+_BULK_LIMIT = 100
+
+
+class _ChannelQueue:
+    __slots__ = ("channel", "deletions", "queued", "held", "warnings", "timeouts", "task")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.deletions: list[discord.Message] = []
+        self.queued: set[int] = set()
+        self.held: dict[int, tuple[int, str]] = {}
+        self.warnings: dict[int, tuple[str, int]] = {}
+        self.timeouts: dict[int, tuple[discord.Member, int, str]] = {}
+        self.task: asyncio.Task | None = None
+
+    def pending(self) -> bool:
+        return bool(self.deletions or self.warnings or self.timeouts)
+
+
+class _Warning:
+    __slots__ = ("message", "sent_at", "count")
+
+    def __init__(self, message: discord.Message, sent_at: float, count: int):
+        self.message = message
+        self.sent_at = sent_at
+        self.count = count
+
+
+class ModerationQueue:
+    def __init__(self, cog):
+        self.cog = cog
+        self.log = getattr(cog, "log", None)
+        self._channels: dict[int, _ChannelQueue] = {}
+        self._warnings: dict[tuple[int, int], _Warning] = {}
+
+    def _queue(self, channel) -> _ChannelQueue:
+        q = self._channels.get(channel.id)
+        if q is None:
+            q = _ChannelQueue(channel)
+            self._channels[channel.id] = q
+        return q
+
+    def submit(self, message: discord.Message, mention: str, delete: bool, warn: bool) -> None:
+        channel = message.channel
+        if channel is None or not (delete or warn):
+            return
+        q = self._queue(channel)
+
+        if delete:
+            if message.id in q.queued:
+                return
+            q.queued.add(message.id)
+            q.deletions.append(message)
+            if warn:
+                q.held[message.id] = (message.author.id, mention)
+        elif warn:
+            self._add_warning(q, message.author.id, mention)
+
+        self._schedule(q)
+
+    def _add_warning(self, q: _ChannelQueue, user_id: int, mention: str) -> None:
+        prev = q.warnings.get(user_id)
+        q.warnings[user_id] = (mention, (prev[1] if prev else 0) + 1)
+
+    def submit_timeout(self, channel, member: discord.Member, seconds: int, reason: str) -> None:
+        q = self._queue(channel)
+        prev = q.timeouts.get(member.id)
+        if prev is None or seconds > prev[1]:
+            q.timeouts[member.id] = (member, seconds, reason)
+        self._schedule(q)
+
+    def _schedule(self, q: _ChannelQueue) -> None:
+        if q.task is None or q.task.done():
+            q.task = asyncio.create_task(self._drain(q))
+
+    def cancel(self) -> None:
+        for q in self._channels.values():
+            if q.task and not q.task.done():
+                q.task.cancel()
+        self._channels.clear()
+        self._warnings.clear()
+
+    async def _drain(self, q: _ChannelQueue):
+        try:
+            await asyncio.sleep(self.cog._batch_delay())
+            while q.pending():
+                while q.deletions:
+                    batch = q.deletions[:_BULK_LIMIT]
+                    del q.deletions[:_BULK_LIMIT]
+                    q.queued.difference_update(m.id for m in batch)
+                    deleted = await self._delete(q.channel, batch)
+                    for m in batch:
+                        held = q.held.pop(m.id, None)
+                        if held is not None and m.id in deleted:
+                            self._add_warning(q, held[0], held[1])
+                if q.timeouts:
+                    uid = next(iter(q.timeouts))
+                    member, seconds, reason = q.timeouts.pop(uid)
+                    await self._timeout(member, seconds, reason)
+                    continue
+                if q.warnings:
+                    uid = next(iter(q.warnings))
+                    mention, count = q.warnings.pop(uid)
+                    await self._warn(q.channel, uid, mention, count)
+        except asyncio.CancelledError:
+            return
+        finally:
+            if self._channels.get(q.channel.id) is q and not q.pending():
+                self._channels.pop(q.channel.id, None)
+
+    async def _delete(self, channel, batch: list[discord.Message]) -> set[int]:
+        if len(batch) > 1 and hasattr(channel, "delete_messages"):
+            try:
+                await channel.delete_messages(batch, reason="Link filter")
+                return {m.id for m in batch}
+            except Exception as e:
+                if self.log:
+                    self.log.warning(f"linkfilter_bulk_delete_failed | channel={channel.id} | count={len(batch)} | {e}")
+
+        deleted = set()
+        for m in batch:
+            try:
+                await m.delete()
+            except Exception:
+                continue
+            deleted.add(m.id)
+        return deleted
+
+    async def _timeout(self, member: discord.Member, seconds: int, reason: str):
+        try:
+            await member.timeout(timedelta(seconds=seconds), reason=reason)
+        except Exception as e:
+            if self.log:
+                self.log.warning(f"linkfilter_timeout_failed | guild={member.guild.id} | user={member.id} | seconds={seconds} | {e}")
+
+    def _prune_warnings(self, now: float, window: float) -> None:
+        expired = [k for k, w in self._warnings.items() if now - w.sent_at >= window]
+        for k in expired:
+            self._warnings.pop(k, None)
+
+    async def _warn(self, channel, user_id: int, mention: str, count: int):
+        now = time.monotonic()
+        window = float(self.cog._warn_window())
+        self._prune_warnings(now, window)
+
+        base = self.cog._warn_message().replace("{user}", mention)
+        key = (channel.id, user_id)
+        existing = self._warnings.get(key)
+        if existing is not None:
+            existing.count += count
+            try:
+                await existing.message.edit(content=f"{base} (x{existing.count})")
+                return
+            except Exception:
+                self._warnings.pop(key, None)
+
+        try:
+            warn = await channel.send(base if count <= 1 else f"{base} (x{count})")
+        except Exception:
+            return
+        self._warnings[key] = _Warning(warn, now, count)
+
+        d = self.cog._warn_delete_after()
+        if d > 0:
+            try:
+                await warn.delete(delay=d)
+            except Exception:
+                pass
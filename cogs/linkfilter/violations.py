@@ -0,0 +1,86 @@
+import time
+from collections import OrderedDict
+
+
+class _Counter:
+    __slots__ = ("start", "prev", "curr", "level")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.prev = 0
+        self.curr = 0
+        self.level = 0
+
+
+class ViolationTracker:
+    def __init__(self, window_seconds: float = 600.0, max_users: int = 100000):
+        self.window = max(1.0, float(window_seconds))
+        self.max_users = max(1, int(max_users))
+        self._data: OrderedDict[int, _Counter] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def configure(self, window_seconds: float, max_users: int) -> None:
+        window = max(1.0, float(window_seconds))
+        if window != self.window:
+            self.window = window
+            self._data.clear()
+        self.max_users = max(1, int(max_users))
+
+    def _roll(self, c: _Counter, now: float) -> None:
+        elapsed = now - c.start
+        if elapsed < self.window:
+            return
+        if elapsed < 2 * self.window:
+            c.prev = c.curr
+            c.start += self.window
+        else:
+            c.prev = 0
+            c.start = now
+        c.curr = 0
+
+    def _estimate(self, c: _Counter, now: float) -> float:
+        weight = 1.0 - (now - c.start) / self.window
+        return c.prev * max(0.0, weight) + c.curr
+
+    def _expire(self, now: float) -> None:
+        limit = 2 * self.window
+        while self._data:
+            c = next(iter(self._data.values()))
+            if now - c.start < limit and len(self._data) <= self.max_users:
+                break
+            self._data.popitem(last=False)
+
+    def record(self, user_id: int, now: float | None = None) -> int:
+        now = time.monotonic() if now is None else now
+        c = self._data.get(user_id)
+        if c is None:
+            c = _Counter(now)
+            self._data[user_id] = c
+        else:
+            self._roll(c, now)
+            self._data.move_to_end(user_id)
+        c.curr += 1
+        self._expire(now)
+        return int(round(self._estimate(c, now)))
+
+    def count(self, user_id: int, now: float | None = None) -> int:
+        c = self._data.get(user_id)
+        if c is None:
+            return 0
+        now = time.monotonic() if now is None else now
+        self._roll(c, now)
+        return int(round(self._estimate(c, now)))
+
+    def escalate(self, user_id: int, level: int) -> bool:
+        c = self._data.get(user_id)
+        if c is None or level <= c.level:
+            return False
+        c.level = level
+        return True
+
+    def reset_level_if_below(self, user_id: int, level: int) -> None:
+        c = self._data.get(user_id)
+        if c is not None and c.level > level:
+            c.level = level
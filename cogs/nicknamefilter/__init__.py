@@ -1,5 +1,8 @@
 from .nicknamefilter import NicknameFilter
+import discord
 
 
 async def setup(bot):
-    await bot.add_cog(NicknameFilter(bot))
+    gid = int(bot.cfg.get("guild_id", 0) or 0)
+    guild = discord.Object(id=gid) if gid else None
+    await bot.add_cog(NicknameFilter(bot), guild=guild)
@@ -0,0 +1,38 @@
+import unicodedata
+
+_ZERO_WIDTH = (
+    "\u00ad\u034f\u115f\u1160\u180e\u200b\u200c\u200d"
+    "\u200e\u200f\u2060\u2061\u2062\u2063\u2064\u3164\ufeff\uffa0"
+)
+
+_CONFUSABLES = {
+    "\u0430": "a", "\u0432": "b", "\u0435": "e", "\u043e": "o", "\u0440": "p", "\u0441": "c",
+    "\u0443": "y", "\u0445": "x", "\u0456": "i", "\u0458": "j", "\u0455": "s", "\u04bb": "h",
+    "\u0501": "d", "\u051b": "q", "\u051d": "w", "\u04cf": "l", "\u043a": "k", "\u043c": "m",
+    "\u043d": "h", "\u0442": "t", "\u0457": "i", "\u03b1": "a", "\u03b2": "b", "\u03b5": "e",
+    "\u03b7": "n", "\u03b9": "i", "\u03ba": "k", "\u03bd": "v", "\u03bf": "o", "\u03c1": "p",
+    "\u03c4": "t", "\u03c5": "u", "\u03c7": "x", "\u0131": "i", "\u0237": "j", "\u2113": "l",
+    "\u0251": "a", "\u0261": "g", "\u0269": "i", "\u026a": "i", "\u0299": "b", "\u1d00": "a",
+    "\u1d04": "c", "\u1d05": "d", "\u1d07": "e", "\u0262": "g", "\u029c": "h", "\u1d0a": "j",
+    "\u1d0b": "k", "\u029f": "l", "\u1d0d": "m", "\u0274": "n", "\u1d0f": "o", "\u1d18": "p",
+    "\u0280": "r", "\ua731": "s", "\u1d1b": "t", "\u1d1c": "u", "\u1d20": "v", "\u1d21": "w",
+    "\u028f": "y", "\u1d22": "z",
+}
+
+_LEET = {
+    "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "9": "g",
+    "@": "a", "$": "s", "!": "i", "|": "l", "+": "t", "\u20ac": "e",
+}
+
+_SKELETON_TABLE = str.maketrans({**{c: None for c in _ZERO_WIDTH}, **_CONFUSABLES})
+_LEET_TABLE = str.maketrans(_LEET)
+
+
+def skeleton(text: str) -> str:
+    if text.isascii():
+        return text.lower()
+    return unicodedata.normalize("NFKC", text).casefold().translate(_SKELETON_TABLE)
+
+
+def fold(text: str) -> str:
+    return skeleton(text).translate(_LEET_TABLE)
@@ -0,0 +1,114 @@
+import re
+
+from .fold import fold, skeleton
+
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+class AhoCorasick:
+    __slots__ = ("_goto", "_fail", "_out")
+
+    def __init__(self, words: list[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[bool] = [False]
+        for w in words:
+            if w:
+                self._add(w)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def _add(self, word: str) -> None:
+        state = 0
+        for ch in word:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(False)
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._out[state] = True
+
+    def _build(self) -> None:
+        queue = list(self._goto[0].values())
+        i = 0
+        while i < len(queue):
+            state = queue[i]
+            i += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = True
+
+    def search(self, text: str) -> bool:
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        if len(goto) == 1:
+            return False
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                return True
+        return False
+
+
+class CompiledMatcher:
+    __slots__ = ("words", "patterns", "combined", "word_count", "pattern_count")
+
+    def __init__(self, words: list[str], patterns: list[str]):
+        uniq = list(dict.fromkeys(fold(w) for w in words if w))
+        self.words = AhoCorasick(uniq)
+        self.word_count = len(uniq)
+
+        valid = []
+        for p in dict.fromkeys(patterns):
+            try:
+                re.compile(p, re.IGNORECASE)
+            except re.error:
+                continue
+            valid.append(p)
+        self.pattern_count = len(valid)
+
+        self.combined: re.Pattern | None = None
+        self.patterns: list[re.Pattern] = []
+        if valid and any(_BACKREF_RE.search(p) for p in valid):
+            self.patterns = [re.compile(p, re.IGNORECASE) for p in valid]
+        elif valid:
+            try:
+                self.combined = re.compile("|".join(f"(?:{p})" for p in valid), re.IGNORECASE)
+            except re.error:
+                self.patterns = [re.compile(p, re.IGNORECASE) for p in valid]
+
+    def has_word(self, name: str) -> bool:
+        return self.words.search(fold(name))
+
+    def has_pattern(self, name: str) -> bool:
+        if self._search_patterns(name):
+            return True
+        if not name.isascii():
+            return self._search_patterns(skeleton(name))
+        return False
+
+    def _search_patterns(self, text: str) -> bool:
+        if self.combined is not None:
+            return self.combined.search(text) is not None
+        for rx in self.patterns:
+            if rx.search(text):
+                return True
+        return False
+
+    def matches(self, name: str) -> bool:
+        return self.has_word(name) or self.has_pattern(name)
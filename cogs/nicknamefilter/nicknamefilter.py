@@ -1,7 +1,13 @@
-import re
+import asyncio
+from collections import OrderedDict
+
 import discord
+from discord import app_commands
 from discord.ext import commands
 
+from .matcher import CompiledMatcher
+from .sweep import NicknameSweep, SweepCheckpoints, SweepState
+
 
 def _cfg(bot) -> dict:
     cfg = getattr(bot, "cfg", None)
@@ -47,20 +53,50 @@ def _words(bot) -> list[str]:
     return out
 
 
-def _regex(bot) -> list[re.Pattern]:
+def _regex(bot) -> list[str]:
     v = _cfg(bot).get("disallowed_regex", [])
     if not isinstance(v, list):
         return []
     out = []
     for s in v:
         if isinstance(s, str) and s.strip():
-            try:
-                out.append(re.compile(s, re.IGNORECASE))
-            except Exception:
-                pass
+            out.append(s)
     return out
 
 
+def _compile_matcher(bot) -> tuple[int, CompiledMatcher]:
+    cached = getattr(bot, "_nickname_matcher", None)
+    version = (cached[0] + 1) if cached is not None else 1
+    matcher = CompiledMatcher(_words(bot), _regex(bot))
+    bot._nickname_matcher = (version, matcher)
+    log = getattr(bot, "log", None)
+    if log:
+        log.info(f"nickname_filter_compiled | version={version} | words={matcher.word_count} | patterns={matcher.pattern_count} | states={len(matcher.words)}")
+    return version, matcher
+
+
+def _matcher(bot) -> tuple[int, CompiledMatcher]:
+    cached = getattr(bot, "_nickname_matcher", None)
+    if cached is not None:
+        return cached
+    return _compile_matcher(bot)
+
+
+def _verdict_cache_size(bot) -> int:
+    try:
+        return max(1, int(_cfg(bot).get("verdict_cache_size", 4096)))
+    except Exception:
+        return 4096
+
+
+def _verdict_cache(bot, version: int) -> OrderedDict:
+    cached = getattr(bot, "_nickname_verdicts", None)
+    if cached is None or cached[0] != version:
+        cached = (version, OrderedDict())
+        bot._nickname_verdicts = cached
+    return cached[1]
+
+
 def _min_len(bot) -> int:
     try:
         return max(0, int(_cfg(bot).get("min_length", 2)))
@@ -93,6 +129,59 @@ def _dm_msg(bot) -> str:
     return str(s) if s is not None else ""
 
 
+def _sweep_cfg(bot) -> dict:
+    v = _cfg(bot).get("sweep", {})
+    return v if isinstance(v, dict) else {}
+
+
+def _sweep_path(bot) -> str:
+    return str(_sweep_cfg(bot).get("storage_path", "data/nickname_sweep.json"))
+
+
+def _sweep_chunk_size(bot) -> int:
+    try:
+        return max(1, min(1000, int(_sweep_cfg(bot).get("chunk_size", 1000))))
+    except Exception:
+        return 1000
+
+
+def _sweep_edit_interval(bot) -> float:
+    try:
+        return max(0, int(_sweep_cfg(bot).get("edit_interval_ms", 1000))) / 1000.0
+    except Exception:
+        return 1.0
+
+
+def _sweep_perm_cfg(bot) -> dict:
+    v = _cfg(bot).get("sweep_permissions", {})
+    return v if isinstance(v, dict) else {}
+
+
+def _sweep_role_ids(bot) -> set[int]:
+    v = _sweep_perm_cfg(bot).get("role_ids", [])
+    if not isinstance(v, list):
+        return set()
+    out = set()
+    for x in v:
+        try:
+            out.add(int(x))
+        except Exception:
+            pass
+    return out
+
+
+def _is_allowed_to_sweep(bot, member: discord.Member) -> bool:
+    p = _sweep_perm_cfg(bot)
+    role_ids = _sweep_role_ids(bot)
+    if role_ids and any(r.id in role_ids for r in member.roles):
+        return True
+    if bool(p.get("require_administrator", True)) and member.guild_permissions.administrator:
+        return True
+    if bool(p.get("require_manage_guild", False)) and member.guild_permissions.manage_guild:
+        return True
+    return False
+
+
 def _is_exempt(bot, member: discord.Member) -> bool:
     if _admin_exempt(bot) and member.guild_permissions.administrator:
         return True
@@ -108,44 +197,54 @@ def _violates(bot, nickname: str) -> bool:
     name = nickname.strip()
     if not name:
         return False
-    if len(name) < _min_len(bot):
-        return True
-    if len(name) > _max_len(bot):
-        return True
 
-    low = name.lower()
-    for w in _words(bot):
-        if w in low:
-            return True
+    version, matcher = _matcher(bot)
+    cache = _verdict_cache(bot, version)
+    hit = cache.get(name)
+    if hit is not None:
+        cache.move_to_end(name)
+        return hit
 
-    for rx in _regex(bot):
-        if rx.search(name):
-            return True
-
-    return False
+    result = len(name) < _min_len(bot) or len(name) > _max_len(bot) or matcher.matches(name)
+    cache[name] = result
+    if len(cache) > _verdict_cache_size(bot):
+        cache.popitem(last=False)
+    return result
 
 
 class NicknameFilter(commands.Cog):
+    nickfilter = app_commands.Group(name="nickfilter", description="Nickname filter commands.")
+
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-
-    async def _enforce(self, member: discord.Member):
+        self.log = getattr(bot, "log", None)
+        _compile_matcher(bot)
+        self.checkpoints = SweepCheckpoints(_sweep_path(bot), self.log)
+        self._sweeps: dict[int, asyncio.Task] = {}
+        self._resumed = False
+
+    async def cog_unload(self) -> None:
+        for task in self._sweeps.values():
+            if not task.done():
+                task.cancel()
+        self._sweeps.clear()
+
+    def _needs_reset(self, member: discord.Member) -> bool:
         if not _enabled(self.bot):
-            return
+            return False
         if _guild_only(self.bot) and member.guild is None:
-            return
+            return False
         if _is_exempt(self.bot, member):
-            return
-
+            return False
         nick = member.nick if member.nick is not None else member.display_name
-        if not _violates(self.bot, str(nick)):
-            return
+        return _violates(self.bot, str(nick))
 
+    async def _apply(self, member: discord.Member) -> bool:
         if _reset_nick(self.bot):
             try:
                 await member.edit(nick=None, reason="Nickname filter")
             except Exception:
-                return
+                return False
 
         if _dm_user(self.bot):
             msg = _dm_msg(self.bot)
@@ -154,6 +253,42 @@ class NicknameFilter(commands.Cog):
                     await member.send(msg)
                 except Exception:
                     pass
+        return True
+
+    async def _enforce(self, member: discord.Member):
+        if self._needs_reset(member):
+            await self._apply(member)
+
+    def _sweep_running(self, guild_id: int) -> bool:
+        task = self._sweeps.get(guild_id)
+        return task is not None and not task.done()
+
+    def _start_sweep(self, guild: discord.Guild, state: SweepState) -> None:
+        sweep = NicknameSweep(self, guild, state, self.checkpoints, _sweep_chunk_size(self.bot), _sweep_edit_interval(self.bot))
+        self._sweeps[guild.id] = asyncio.create_task(self._run_sweep(sweep))
+
+    async def _run_sweep(self, sweep: NicknameSweep) -> None:
+        if self.log:
+            self.log.info(f"nickname_sweep_started | guild={sweep.state.guild_id} | after={sweep.state.after} | scanned={sweep.state.scanned}")
+        try:
+            await sweep.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if self.log:
+                self.log.exception(f"nickname_sweep_error | guild={sweep.state.guild_id} | after={sweep.state.after} | {e}")
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        if self._resumed:
+            return
+        self._resumed = True
+        for guild_id, state in list(self.checkpoints.states.items()):
+            if state.finished or self._sweep_running(guild_id):
+                continue
+            guild = self.bot.get_guild(guild_id)
+            if guild is not None:
+                self._start_sweep(guild, state)
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
@@ -164,3 +299,63 @@ class NicknameFilter(commands.Cog):
         if before.nick == after.nick:
             return
         await self._enforce(after)
+
+    @nickfilter.command(name="sweep", description="Scan all existing members and reset violating nicknames.")
+    @app_commands.describe(restart="Start over instead of resuming from the last checkpoint")
+    async def nickfilter_sweep(self, interaction: discord.Interaction, restart: bool = False):
+        if not _enabled(self.bot):
+            await interaction.response.send_message("Nickname filter is disabled.", ephemeral=True)
+            return
+        if interaction.guild is None or not isinstance(interaction.user, discord.Member):
+            await interaction.response.send_message("This command is only available in a server.", ephemeral=True)
+            return
+        if not _is_allowed_to_sweep(self.bot, interaction.user):
+            await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+            return
+
+        guild = interaction.guild
+        if self._sweep_running(guild.id):
+            await interaction.response.send_message("A sweep is already running. Use `/nickfilter status` to follow it.", ephemeral=True)
+            return
+
+        state = self.checkpoints.get(guild.id)
+        if restart or state is None or state.finished:
+            state = self.checkpoints.fresh(guild.id)
+            await interaction.response.send_message("Nickname sweep started.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"Nickname sweep resumed after {state.scanned} scanned members.", ephemeral=True)
+        self._start_sweep(guild, state)
+
+    @nickfilter.command(name="status", description="Show nickname sweep progress.")
+    async def nickfilter_status(self, interaction: discord.Interaction):
+        if interaction.guild is None or not isinstance(interaction.user, discord.Member):
+            await interaction.response.send_message("This command is only available in a server.", ephemeral=True)
+            return
+        if not _is_allowed_to_sweep(self.bot, interaction.user):
+            await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+            return
+
+        state = self.checkpoints.get(interaction.guild.id)
+        if state is None:
+            await interaction.response.send_message("No sweep has been run yet.", ephemeral=True)
+            return
+
+        if self._sweep_running(state.guild_id):
+            status = "running"
+        elif state.finished:
+            status = "finished"
+        else:
+            status = "paused"
+
+        total = interaction.guild.member_count or 0
+        progress = f"{state.scanned}/{total}" if total else str(state.scanned)
+        lines = [
+            f"Status: **{status}**",
+            f"Scanned: **{progress}**",
+            f"Violations: **{state.violations}**",
+            f"Nicknames reset: **{state.reset}**",
+            f"Failed resets: **{state.failed}**",
+            f"Throughput: **{state.throughput():.1f}** members/s",
+            f"Started: <t:{state.started_ts}:R> | Updated: <t:{state.updated_ts}:R>",
+        ]
+        await interaction.response.send_message("\n".join(lines), ephemeral=True)
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, fields
+
+import discord
+
+
+@dataclass
+class SweepState:
+    guild_id: int
+    after: int = 0
+    scanned: int = 0
+    violations: int = 0
+    reset: int = 0
+    failed: int = 0
+    active_seconds: float = 0.0
+    started_ts: int = 0
+    updated_ts: int = 0
+    finished: bool = False
+
+    def throughput(self) -> float:
+        if self.active_seconds <= 0:
+            return 0.0
+        return self.scanned / self.active_seconds
+
+
+class SweepCheckpoints:
+    def __init__(self, path: str, log=None):
+        self.path = path
+        self.log = log
+        self.states: dict[int, SweepState] = {}
+        self._load()
+
+    def _load(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except Exception:
+            return
+        if not isinstance(raw, dict):
+            return
+        names = {f.name for f in fields(SweepState)}
+        for k, v in raw.items():
+            if not isinstance(v, dict):
+                continue
+            try:
+                st = SweepState(**{n: v[n] for n in names if n in v})
+                self.states[int(k)] = st
+            except Exception:
+                continue
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        payload = {str(k): asdict(v) for k, v in self.states.items()}
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            if self.log:
+                self.log.exception(f"nickname_sweep_checkpoint_error | {e}")
+
+    def get(self, guild_id: int) -> SweepState | None:
+        return self.states.get(guild_id)
+
+    def fresh(self, guild_id: int) -> SweepState:
+        now = int(time.time())
+        st = SweepState(guild_id=guild_id, started_ts=now, updated_ts=now)
+        self.states[guild_id] = st
+        self.save()
+        return st
+
+
+class NicknameSweep:
+    def __init__(self, cog, guild: discord.Guild, state: SweepState, store: SweepCheckpoints, chunk_size: int, edit_interval: float):
+        self.cog = cog
+        self.guild = guild
+        self.state = state
+        self.store = store
+        self.chunk_size = max(1, chunk_size)
+        self.edit_interval = max(0.0, edit_interval)
+        self.log = getattr(cog, "log", None)
+        self._queue: asyncio.Queue[discord.Member] = asyncio.Queue(maxsize=self.chunk_size)
+        self._worker: asyncio.Task | None = None
+
+    async def run(self) -> None:
+        worker = self._worker = asyncio.create_task(self._edit_worker())
+        try:
+            kwargs = {"limit": None}
+            if self.state.after:
+                kwargs["after"] = discord.Object(id=self.state.after)
+
+            chunk: list[discord.Member] = []
+            started = time.monotonic()
+            async for member in self.guild.fetch_members(**kwargs):
+                chunk.append(member)
+                if len(chunk) >= self.chunk_size:
+                    started = await self._process(chunk, started)
+                    chunk = []
+            if chunk:
+                await self._process(chunk, started)
+
+            self.state.finished = True
+            self.state.updated_ts = int(time.time())
+            self.store.save()
+            if self.log:
+                self.log.info(self._progress("nickname_sweep_finished"))
+        finally:
+            worker.cancel()
+
+    async def _process(self, chunk: list[discord.Member], started: float) -> float:
+        st = self.state
+        for member in chunk:
+            st.scanned += 1
+            if not self.cog._needs_reset(member):
+                continue
+            st.violations += 1
+            if member.nick is not None:
+                await self._watch(self._queue.put(member))
+        await self._watch(self._queue.join())
+
+        now = time.monotonic()
+        st.after = chunk[-1].id
+        st.active_seconds += now - started
+        st.updated_ts = int(time.time())
+        self.store.save()
+        if self.log:
+            self.log.info(self._progress("nickname_sweep_progress"))
+        return now
+
+    async def _watch(self, aw) -> None:
+        t = asyncio.ensure_future(aw)
+        try:
+            done, _ = await asyncio.wait({t, self._worker}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not t.done():
+                t.cancel()
+        if t in done:
+            t.result()
+            return
+        error = self._worker.exception() if not self._worker.cancelled() else None
+        raise RuntimeError(f"nickname sweep edit worker stopped: {error!r}")
+
+    async def _edit_worker(self):
+        while True:
+            member = await self._queue.get()
+            try:
+                if await self.cog._apply(member):
+                    self.state.reset += 1
+                else:
+                    self.state.failed += 1
+            except Exception as e:
+                self.state.failed += 1
+                if self.log:
+                    self.log.exception(f"nickname_sweep_edit_error | guild={self.state.guild_id} | user={member.id} | {e}")
+            finally:
+                self._queue.task_done()
+            if self.edit_interval > 0:
+                await asyncio.sleep(self.edit_interval)
+
+    def _progress(self, event: str) -> str:
+        st = self.state
+        return (
+            f"{event} | guild={st.guild_id} | scanned={st.scanned} | violations={st.violations} | "
+            f"reset={st.reset} | failed={st.failed} | rate={st.throughput():.1f}/s | after={st.after}"
+        )
@@ -5,6 +5,7 @@ import discord
 from discord import app_commands
 from typing import Any
 
+from .panels import Mode, Panel, PanelCache, parse_mode
 from .storage import JsonStorage
 
 
@@ -135,12 +136,7 @@ def _style_from_str(s: str) -> discord.ButtonStyle:
 
 
 def _mode_from_str(s: str) -> str:
-    x = (s or "").strip().lower()
-    if x in ("add", "add_only"):
-        return "add"
-    if x in ("remove", "remove_only"):
-        return "remove"
-    return "toggle"
+    return parse_mode(s).value
 
 
 def _parse_color_raw(color_raw: str | None) -> discord.Color | None:
@@ -158,63 +154,97 @@ def _parse_color_raw(color_raw: str | None) -> discord.Color | None:
         return None
 
 
-async def _safe_add_role(member: discord.Member, role: discord.Role) -> bool:
+async def _safe_remove_role(member: discord.Member, role: discord.Role) -> bool:
     try:
-        await member.add_roles(role, reason="Reaction roles")
+        await member.remove_roles(role, reason="Reaction roles")
         return True
     except Exception:
         return False
 
 
-async def _safe_remove_role(member: discord.Member, role: discord.Role) -> bool:
+def _default_toggle_modes(bot) -> dict[str, bool]:
+    return {"buttons": _default_toggle_mode(bot, "buttons"), "select": _default_toggle_mode(bot, "select")}
+
+
+def _panel(bot, panel_id: str) -> Panel | None:
+    cache: PanelCache | None = getattr(bot, "_rr_panels", None)
+    return cache.get(panel_id) if cache is not None else None
+
+
+async def _save_panel(bot, panel_id: str, panel: dict[str, Any]) -> None:
+    storage: JsonStorage = bot._rr_storage
+    await storage.set(panel_id, panel)
+    bot._rr_panels.put(panel_id, panel)
+
+
+async def _delete_panel(bot, panel_id: str) -> None:
+    storage: JsonStorage = bot._rr_storage
+    await storage.delete(panel_id)
+    bot._rr_panels.remove(panel_id)
+
+
+async def _apply_roles(member: discord.Member, add: list[discord.Role], remove: list[discord.Role]) -> bool:
+    if not add and not remove:
+        return True
     try:
-        await member.remove_roles(role, reason="Reaction roles")
+        if len(add) <= 1 and len(remove) <= 1:
+            if remove:
+                await member.remove_roles(remove[0], reason="Reaction roles")
+            if add:
+                await member.add_roles(add[0], reason="Reaction roles")
+            return True
+        fresh = member.guild.get_member(member.id) or member
+        drop = {r.id for r in remove}
+        keep = [r for r in fresh.roles if not r.is_default() and r.id not in drop]
+        have = {r.id for r in keep}
+        await member.edit(roles=keep + [r for r in add if r.id not in have], reason="Reaction roles")
         return True
     except Exception:
         return False
 
 
-def _find_item(panel: dict[str, Any], role_id: int) -> dict[str, Any] | None:
-    items = panel.get("items", [])
-    if not isinstance(items, list):
-        return None
-    for it in items:
-        if isinstance(it, dict) and _to_int(it.get("role_id", 0), 0) == role_id:
-            return it
-    return None
+def _split_assignable(roles: list[discord.Role]) -> tuple[list[discord.Role], list[discord.Role]]:
+    ok = []
+    blocked = []
+    for r in roles:
+        (ok if r.is_assignable() else blocked).append(r)
+    return ok, blocked
+
 
+def _role_names(roles: list[discord.Role]) -> str:
+    return ", ".join(r.name for r in roles)
 
-def _group_of_item(it: dict[str, Any] | None) -> str:
-    if not it:
-        return ""
-    g = it.get("group", "")
-    if not isinstance(g, str):
-        return ""
-    return g.strip().lower()
 
+def _diff_message(bot, added: list[discord.Role], removed: list[discord.Role], skipped: list[discord.Role] | None = None) -> str:
+    if skipped:
+        lines = [_diff_message(bot, added, removed)] if added or removed else []
+        lines.append(_msg(bot, "roles_skipped", "Skipped (I can't manage): {roles}").replace("{roles}", _role_names(skipped)))
+        return "\n".join(lines)
+    if not added and not removed:
+        return _msg(bot, "no_changes", "No changes.")
+    if len(added) + len(removed) == 1:
+        if added:
+            return _msg(bot, "role_added", "Role added: {role}").replace("{role}", added[0].name)
+        return _msg(bot, "role_removed", "Role removed: {role}").replace("{role}", removed[0].name)
+    lines = []
+    if added:
+        lines.append(_msg(bot, "roles_added", "Added: {roles}").replace("{roles}", _role_names(added)))
+    if removed:
+        lines.append(_msg(bot, "roles_removed", "Removed: {roles}").replace("{roles}", _role_names(removed)))
+    return "\n".join(lines)
 
-async def _remove_other_group_roles(bot, guild: discord.Guild, member: discord.Member, panel: dict[str, Any], group: str, keep_role_id: int):
+
+def _other_group_roles(bot, member: discord.Member, panel: Panel, group: str, keep_role_id: int) -> list[discord.Role]:
     if not group:
-        return False
+        return []
     if not _exclusive_groups_enabled(bot):
-        return False
-    items = panel.get("items", [])
-    if not isinstance(items, list):
-        return False
-    changed = False
-    for it in items:
-        if not isinstance(it, dict):
-            continue
-        rid = _to_int(it.get("role_id", 0), 0)
-        if rid <= 0 or rid == keep_role_id:
-            continue
-        if _group_of_item(it) != group:
-            continue
-        role = guild.get_role(rid)
-        if role and role in member.roles:
-            ok = await _safe_remove_role(member, role)
-            changed = changed or ok
-    return changed
+        return []
+    out = []
+    for rid in panel.peers(group, keep_role_id):
+        role = member.get_role(rid)
+        if role is not None:
+            out.append(role)
+    return out
 
 
 class RRButtonsView(discord.ui.View):
@@ -283,9 +313,8 @@ async def handle_button(interaction: discord.Interaction, panel_id: str, role_id
         await interaction.response.send_message(_msg(bot, "server_only", "This command can only be used in a server."), ephemeral=True)
         return
 
-    storage: JsonStorage = bot._rr_storage
-    panel = await storage.get(panel_id)
-    if not panel or _to_int(panel.get("guild_id", 0), 0) != interaction.guild.id:
+    panel = _panel(bot, panel_id)
+    if panel is None or panel.guild_id != interaction.guild.id:
         await interaction.response.send_message(_msg(bot, "panel_missing", "This panel no longer exists."), ephemeral=True)
         return
 
@@ -295,23 +324,23 @@ async def handle_button(interaction: discord.Interaction, panel_id: str, role_id
         return
 
     member = interaction.user
-    it = _find_item(panel, role_id)
-    mode = _mode_from_str(str((it or {}).get("mode", "toggle")))
-    group = _group_of_item(it)
+    it = panel.item(role_id)
+    mode = it.mode if it is not None else Mode.TOGGLE
+    group = it.group if it is not None else ""
 
-    if mode == "add":
+    if mode is Mode.ADD:
         if role not in member.roles:
-            await _remove_other_group_roles(bot, interaction.guild, member, panel, group, role_id)
-            ok = await _safe_add_role(member, role)
+            removed, _ = _split_assignable(_other_group_roles(bot, member, panel, group, role_id))
+            ok = await _apply_roles(member, [role], removed)
             if ok:
-                await interaction.response.send_message(_msg(bot, "role_added", "Role added: {role}").replace("{role}", role.name), ephemeral=True)
+                await interaction.response.send_message(_diff_message(bot, [role], removed), ephemeral=True)
             else:
                 await interaction.response.send_message(_msg(bot, "cant_add_role", "I can't add that role."), ephemeral=True)
         else:
             await interaction.response.send_message(_msg(bot, "no_changes", "No changes."), ephemeral=True)
         return
 
-    if mode == "remove":
+    if mode is Mode.REMOVE:
         if role in member.roles:
             ok = await _safe_remove_role(member, role)
             if ok:
@@ -329,10 +358,10 @@ async def handle_button(interaction: discord.Interaction, panel_id: str, role_id
         else:
             await interaction.response.send_message(_msg(bot, "cant_remove_role", "I can't remove that role."), ephemeral=True)
     else:
-        await _remove_other_group_roles(bot, interaction.guild, member, panel, group, role_id)
-        ok = await _safe_add_role(member, role)
+        removed, _ = _split_assignable(_other_group_roles(bot, member, panel, group, role_id))
+        ok = await _apply_roles(member, [role], removed)
         if ok:
-            await interaction.response.send_message(_msg(bot, "role_added", "Role added: {role}").replace("{role}", role.name), ephemeral=True)
+            await interaction.response.send_message(_diff_message(bot, [role], removed), ephemeral=True)
         else:
             await interaction.response.send_message(_msg(bot, "cant_add_role", "I can't add that role."), ephemeral=True)
 
@@ -345,25 +374,13 @@ async def handle_select(interaction: discord.Interaction, panel_id: str, values:
         await interaction.response.send_message(_msg(bot, "server_only", "This command can only be used in a server."), ephemeral=True)
         return
 
-    storage: JsonStorage = bot._rr_storage
-    panel = await storage.get(panel_id)
-    if not panel or _to_int(panel.get("guild_id", 0), 0) != interaction.guild.id:
+    panel = _panel(bot, panel_id)
+    if panel is None or panel.guild_id != interaction.guild.id:
         await interaction.response.send_message(_msg(bot, "panel_missing", "This panel no longer exists."), ephemeral=True)
         return
 
-    items = panel.get("items", [])
-    if not isinstance(items, list):
-        items = []
-
-    panel_toggle_mode = _to_bool(panel.get("toggle_mode", _default_toggle_mode(bot, "select")), _default_toggle_mode(bot, "select"))
-
-    valid_items: dict[int, dict[str, Any]] = {}
-    for it in items[:25]:
-        if not isinstance(it, dict):
-            continue
-        rid = _to_int(it.get("role_id", 0), 0)
-        if rid > 0:
-            valid_items[rid] = it
+    panel_toggle_mode = panel.toggle_mode
+    valid_items = panel.items
 
     selected_ids_raw: list[int] = []
     for v in values:
@@ -374,7 +391,7 @@ async def handle_select(interaction: discord.Interaction, panel_id: str, values:
     group_pick: dict[str, int] = {}
     selected_ids: list[int] = []
     for rid in selected_ids_raw:
-        g = _group_of_item(valid_items.get(rid))
+        g = valid_items[rid].group
         if g and _exclusive_groups_enabled(bot):
             group_pick[g] = rid
         else:
@@ -385,57 +402,58 @@ async def handle_select(interaction: discord.Interaction, panel_id: str, values:
 
     selected_set = set(selected_ids)
     member = interaction.user
-    changed = False
+    add: dict[int, discord.Role] = {}
+    remove: dict[int, discord.Role] = {}
 
     if _exclusive_groups_enabled(bot):
         for rid in selected_set:
-            it = valid_items.get(rid)
-            g = _group_of_item(it)
+            g = valid_items[rid].group
             if g:
-                changed = await _remove_other_group_roles(bot, interaction.guild, member, panel, g, rid) or changed
+                for role in _other_group_roles(bot, member, panel, g, rid):
+                    remove[role.id] = role
 
     if _remove_unselected(bot) and not panel_toggle_mode:
         for rid, it in valid_items.items():
-            g = _group_of_item(it)
+            g = it.group
             if g and _exclusive_groups_enabled(bot):
                 continue
-            role = interaction.guild.get_role(rid)
-            if role and role in member.roles and rid not in selected_set:
-                ok = await _safe_remove_role(member, role)
-                changed = changed or ok
+            if rid in selected_set:
+                continue
+            role = member.get_role(rid)
+            if role is not None:
+                remove[rid] = role
 
     for rid in selected_ids:
-        it = valid_items.get(rid)
-        mode = _mode_from_str(str((it or {}).get("mode", "toggle")))
+        mode = valid_items[rid].mode
         role = interaction.guild.get_role(rid)
         if role is None:
             continue
+        has = member.get_role(rid) is not None
 
-        if mode == "add":
-            if role not in member.roles:
-                ok = await _safe_add_role(member, role)
-                changed = changed or ok
+        if mode is Mode.ADD:
+            if not has:
+                add[rid] = role
             continue
 
-        if mode == "remove":
-            if role in member.roles:
-                ok = await _safe_remove_role(member, role)
-                changed = changed or ok
+        if mode is Mode.REMOVE:
+            if has:
+                remove[rid] = role
             continue
 
-        if panel_toggle_mode:
-            if role in member.roles:
-                ok = await _safe_remove_role(member, role)
-                changed = changed or ok
-            else:
-                ok = await _safe_add_role(member, role)
-                changed = changed or ok
-        else:
-            if role not in member.roles:
-                ok = await _safe_add_role(member, role)
-                changed = changed or ok
+        if panel_toggle_mode and has:
+            remove[rid] = role
+        elif not has:
+            add[rid] = role
+
+    for rid in add:
+        remove.pop(rid, None)
+    added, skipped_add = _split_assignable(list(add.values()))
+    removed, skipped_remove = _split_assignable(list(remove.values()))
 
-    await interaction.response.send_message(_msg(bot, "updated", "Updated.") if changed else _msg(bot, "no_changes", "No changes."), ephemeral=True)
+    if not await _apply_roles(member, added, removed):
+        await interaction.response.send_message(_msg(bot, "cant_update_roles", "I can't update those roles."), ephemeral=True)
+        return
+    await interaction.response.send_message(_diff_message(bot, added, removed, skipped_add + skipped_remove), ephemeral=True)
 
 
 async def _fetch_channel(guild: discord.Guild, channel_id: int):
@@ -539,8 +557,7 @@ async def rr_create_buttons(interaction: discord.Interaction, channel: discord.T
         "items": []
     }
 
-    storage: JsonStorage = bot._rr_storage
-    await storage.set(panel_id, panel)
+    await _save_panel(bot, panel_id, panel)
 
     view = RRButtonsView(bot, panel_id, [])
     await msg.edit(view=view)
@@ -585,8 +602,7 @@ async def rr_create_select(interaction: discord.Interaction, channel: discord.Te
         "items": []
     }
 
-    storage: JsonStorage = bot._rr_storage
-    await storage.set(panel_id, panel)
+    await _save_panel(bot, panel_id, panel)
 
     view = RRSelectView(bot, panel_id, [], placeholder)
     await msg.edit(view=view)
@@ -648,7 +664,7 @@ async def rr_add(interaction: discord.Interaction, panel_id: str, role: discord.
 
     items.append(item)
     panel["items"] = items
-    await storage.set(pid, panel)
+    await _save_panel(bot, pid, panel)
 
     await interaction.response.send_message(_msg(bot, "added_updating", "Added. Updating panel..."), ephemeral=True)
     await _render_panel(bot, pid)
@@ -692,7 +708,7 @@ async def rr_remove(interaction: discord.Interaction, panel_id: str, role: disco
         return
 
     panel["items"] = new_items
-    await storage.set(pid, panel)
+    await _save_panel(bot, pid, panel)
 
     await interaction.response.send_message(_msg(bot, "removed_updating", "Removed. Updating panel..."), ephemeral=True)
     await _render_panel(bot, pid)
@@ -741,7 +757,7 @@ async def rr_delete(interaction: discord.Interaction, panel_id: str, delete_mess
             except Exception:
                 pass
 
-    await storage.delete(pid)
+    await _delete_panel(bot, pid)
     await interaction.response.send_message(_msg(bot, "panel_deleted", "Deleted."), ephemeral=True)
 
 
@@ -761,6 +777,7 @@ async def setup(bot: discord.Client):
 
     path = str(_cfg(bot).get("storage_path", "data/reaction_roles.json"))
     bot._rr_storage = JsonStorage(path, log=getattr(bot, "log", None))
+    bot._rr_panels = PanelCache(_default_toggle_modes(bot))
 
     guild_id = _to_int(getattr(bot, "cfg", {}).get("guild_id", 0), 0)
     guild_obj = discord.Object(id=guild_id) if guild_id else None
@@ -770,6 +787,7 @@ async def setup(bot: discord.Client):
         bot.tree.add_command(rr, override=True)
 
     all_panels = await bot._rr_storage.all()
+    bot._rr_panels.load(all_panels)
     for pid, panel in all_panels.items():
         ptype = str(panel.get("type", "buttons")).lower()
         items = panel.get("items", [])
@@ -0,0 +1,128 @@
+from enum import Enum
+from typing import Any
+
+
+class Mode(str, Enum):
+    TOGGLE = "toggle"
+    ADD = "add"
+    REMOVE = "remove"
+
+
+def _to_int(v, default=0) -> int:
+    try:
+        return int(v)
+    except Exception:
+        return default
+
+
+def _to_bool(v, default=False) -> bool:
+    if isinstance(v, bool):
+        return v
+    if isinstance(v, str):
+        s = v.strip().lower()
+        if s in ("true", "1", "yes", "y", "on"):
+            return True
+        if s in ("false", "0", "no", "n", "off"):
+            return False
+    return default
+
+
+def parse_mode(s: str) -> Mode:
+    x = (s or "").strip().lower()
+    if x in ("add", "add_only"):
+        return Mode.ADD
+    if x in ("remove", "remove_only"):
+        return Mode.REMOVE
+    return Mode.TOGGLE
+
+
+def parse_group(g) -> str:
+    if not isinstance(g, str):
+        return ""
+    return g.strip().lower()
+
+
+class PanelItem:
+    __slots__ = ("role_id", "mode", "group")
+
+    def __init__(self, role_id: int, mode: Mode, group: str):
+        self.role_id = role_id
+        self.mode = mode
+        self.group = group
+
+
+class Panel:
+    __slots__ = ("panel_id", "guild_id", "type", "toggle_mode", "items", "groups")
+
+    def __init__(self, panel_id: str, guild_id: int, ptype: str, toggle_mode: bool, items: dict[int, PanelItem], groups: dict[str, frozenset[int]]):
+        self.panel_id = panel_id
+        self.guild_id = guild_id
+        self.type = ptype
+        self.toggle_mode = toggle_mode
+        self.items = items
+        self.groups = groups
+
+    @classmethod
+    def from_dict(cls, panel_id: str, d: dict[str, Any], default_toggle: dict[str, bool]) -> "Panel":
+        ptype = str(d.get("type", "buttons")).lower()
+        fallback = default_toggle.get("select" if ptype == "select" else "buttons", ptype == "buttons")
+        raw = d.get("items", [])
+        if not isinstance(raw, list):
+            raw = []
+
+        items: dict[int, PanelItem] = {}
+        groups: dict[str, set[int]] = {}
+        for it in raw[:25]:
+            if not isinstance(it, dict):
+                continue
+            rid = _to_int(it.get("role_id", 0), 0)
+            if rid <= 0 or rid in items:
+                continue
+            item = PanelItem(rid, parse_mode(str(it.get("mode", "toggle"))), parse_group(it.get("group", "")))
+            items[rid] = item
+            if item.group:
+                groups.setdefault(item.group, set()).add(rid)
+
+        return cls(
+            panel_id=panel_id,
+            guild_id=_to_int(d.get("guild_id", 0), 0),
+            ptype=ptype,
+            toggle_mode=_to_bool(d.get("toggle_mode", fallback), fallback),
+            items=items,
+            groups={g: frozenset(ids) for g, ids in groups.items()},
+        )
+
+    def item(self, role_id: int) -> PanelItem | None:
+        return self.items.get(role_id)
+
+    def peers(self, group: str, role_id: int) -> frozenset[int]:
+        ids = self.groups.get(group)
+        if not ids:
+            return frozenset()
+        return ids - {role_id}
+
+
+class PanelCache:
+    def __init__(self, default_toggle: dict[str, bool]):
+        self.default_toggle = default_toggle
+        self._panels: dict[str, Panel] = {}
+
+    def __len__(self) -> int:
+        return len(self._panels)
+
+    def get(self, panel_id: str) -> Panel | None:
+        return self._panels.get(panel_id)
+
+    def put(self, panel_id: str, d: dict[str, Any]) -> Panel:
+        p = Panel.from_dict(panel_id, d, self.default_toggle)
+        self._panels[panel_id] = p
+        return p
+
+    def remove(self, panel_id: str) -> None:
+        self._panels.pop(panel_id, None)
+
+    def load(self, panels: dict[str, dict[str, Any]]) -> None:
+        self._panels = {}
+        for pid, d in panels.items():
+            if isinstance(d, dict):
+                self.put(str(pid), d)
@@ -0,0 +1,111 @@
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import discord
+
+
+class MessageContext:
+    __slots__ = ("message", "guild", "channel_id", "is_bot", "_member", "_member_resolved", "_role_ids")
+
+    def __init__(self, message: discord.Message):
+        self.message = message
+        self.guild = message.guild
+        channel = message.channel
+        self.channel_id = channel.id if channel is not None else 0
+        self.is_bot = bool(message.author.bot)
+        self._member: discord.Member | None = message.author if isinstance(message.author, discord.Member) else None
+        self._member_resolved = self._member is not None or self.guild is None
+        self._role_ids: frozenset[int] | None = None
+
+    def in_channels(self, ids: set[int]) -> bool:
+        return self.channel_id in ids
+
+    async def get_member(self) -> discord.Member | None:
+        if not self._member_resolved:
+            self._member_resolved = True
+            try:
+                self._member = await self.guild.fetch_member(self.message.author.id)
+            except Exception:
+                self._member = None
+        return self._member
+
+    async def get_role_ids(self) -> frozenset[int]:
+        if self._role_ids is None:
+            member = await self.get_member()
+            self._role_ids = frozenset(r.id for r in member.roles) if member is not None else frozenset()
+        return self._role_ids
+
+
+StageHandler = Callable[[MessageContext], Awaitable[bool]]
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    stops: int = 0
+    errors: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+
+@dataclass(order=True)
+class Stage:
+    order: int
+    name: str = field(compare=False)
+    handler: StageHandler = field(compare=False)
+    guild_only: bool = field(default=True, compare=False)
+    skip_bots: bool = field(default=True, compare=False)
+    stats: StageStats = field(default_factory=StageStats, compare=False)
+
+
+class MessagePipeline:
+    def __init__(self, log=None, slow_stage_ms: int = 250):
+        self.log = log
+        self.slow_stage_ns = max(0, int(slow_stage_ms)) * 1_000_000
+        self._stages: list[Stage] = []
+
+    def register(self, name: str, handler: StageHandler, order: int, guild_only: bool = True, skip_bots: bool = True) -> None:
+        self.unregister(name)
+        self._stages.append(Stage(order=order, name=name, handler=handler, guild_only=guild_only, skip_bots=skip_bots))
+        self._stages.sort()
+        if self.log:
+            self.log.info("message_pipeline | stages=" + ", ".join(f"{s.order}:{s.name}" for s in self._stages))
+
+    def unregister(self, name: str) -> None:
+        self._stages = [s for s in self._stages if s.name != name]
+
+    def stats(self) -> dict[str, StageStats]:
+        return {s.name: s.stats for s in self._stages}
+
+    async def dispatch(self, message: discord.Message) -> None:
+        if not self._stages:
+            return
+        ctx = MessageContext(message)
+        for stage in tuple(self._stages):
+            if stage.skip_bots and ctx.is_bot:
+                continue
+            if stage.guild_only and ctx.guild is None:
+                continue
+
+            st = stage.stats
+            start = time.perf_counter_ns()
+            stop = False
+            try:
+                stop = bool(await stage.handler(ctx))
+            except Exception as e:
+                st.errors += 1
+                if self.log:
+                    self.log.exception(f"message_stage_error | stage={stage.name} | message={message.id} | {e}")
+            elapsed = time.perf_counter_ns() - start
+
+            st.calls += 1
+            st.total_ns += elapsed
+            if elapsed > st.max_ns:
+                st.max_ns = elapsed
+            if self.slow_stage_ns and elapsed > self.slow_stage_ns and self.log:
+                self.log.warning(f"message_stage_slow | stage={stage.name} | ms={elapsed / 1_000_000:.1f} | message={message.id}")
+
+            if stop:
+                st.stops += 1
+                return